@@ -1,11 +1,11 @@
+import pandas as pd
 
-import plotly.express as px
-
-
-
-
+from utils.timing import timed_import
 
 
+def _px():
+    # plotly.express is the slowest import in the app; load it with the first chart
+    return timed_import("plotly.express")
 
 
 def apply_theme_to_fig(fig, theme):
@@ -33,6 +33,7 @@ def apply_theme_to_fig(fig, theme):
 
 
 def duration_trend_chart(df, theme="dark"):
+    px = _px()
     if df.empty:
         fig = px.line(title="Job Duration Trend (No Data)")
     else:
@@ -48,6 +49,7 @@ def duration_trend_chart(df, theme="dark"):
 
 
 def sla_breach_chart(df, theme="dark"):
+    px = _px()
     if df.empty:
         fig = px.bar(title="SLA Breach Count (No Data)")
     else:
@@ -63,6 +65,7 @@ def sla_breach_chart(df, theme="dark"):
 
 
 def health_score_chart(df, theme="dark"):
+    px = _px()
     if df.empty:
         fig = px.bar(title="Pipeline Health Score (No Data)")
     else:
@@ -79,6 +82,7 @@ def health_score_chart(df, theme="dark"):
 
 
 def volume_trend_chart(df, theme="dark"):
+    px = _px()
     if df.empty:
         fig = px.bar(title="Data Volume Trend (No Data)")
     else:
@@ -93,3 +97,111 @@ def volume_trend_chart(df, theme="dark"):
             color_discrete_sequence=["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6"]
         )
     return apply_theme_to_fig(fig, theme)
+
+
+def extend_duration_traces(fig, df_new):
+    # Live mode: append new points to the affected pipeline traces only
+    if df_new.empty:
+        return fig
+    for pipeline, group in df_new.groupby("PIPELINE_NAME"):
+        traces = [t for t in fig.data if t.name == pipeline]
+        if traces:
+            trace = traces[0]
+            trace.x = tuple(trace.x) + tuple(group["WEEK"])
+            trace.y = tuple(trace.y) + tuple(group["DURATION_MINUTES"])
+        else:
+            fig.add_scatter(
+                x=group["WEEK"],
+                y=group["DURATION_MINUTES"],
+                mode="lines",
+                name=pipeline,
+                legendgroup=pipeline
+            )
+    return fig
+
+
+def replace_duration_points(fig, df_previous, df_current):
+    # Live mode: a row revised in place (e.g. a job that finished) moves its existing point
+    for (_, old), (_, new) in zip(df_previous.iterrows(), df_current.iterrows()):
+        traces = [t for t in fig.data if t.name == old["PIPELINE_NAME"]]
+        if not traces:
+            continue
+        trace = traces[0]
+        xs, ys = list(trace.x), list(trace.y)
+        for i in reversed(range(len(xs))):
+            same_y = ys[i] == old["DURATION_MINUTES"] or (pd.isna(ys[i]) and pd.isna(old["DURATION_MINUTES"]))
+            if xs[i] == old["WEEK"] and same_y:
+                xs[i], ys[i] = new["WEEK"], new["DURATION_MINUTES"]
+                trace.x, trace.y = tuple(xs), tuple(ys)
+                break
+    return fig
+
+
+def duplicate_trend_chart(df, theme="dark"):
+    px = _px()
+    if df.empty:
+        fig = px.line(title="Weekly Duplicate % vs Threshold (No Data)")
+    else:
+        fig = px.line(
+            df,
+            x="WEEK",
+            y="AVG_DUPLICATE_PERCENTAGE",
+            color="SERIES",
+            markers=True,
+            title="Weekly Duplicate % vs Threshold",
+            color_discrete_sequence=["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6"]
+        )
+        for threshold in sorted(df["DUPLICATE_THRESHOLD"].dropna().unique()):
+            fig.add_hline(y=threshold, line_dash="dash", line_color="#EF4444", annotation_text=f"Threshold {threshold:g}%")
+    return apply_theme_to_fig(fig, theme)
+
+
+def null_rate_trend_chart(df, theme="dark"):
+    px = _px()
+    if df.empty:
+        fig = px.line(title="Weekly Nulls per 1k Output Rows (No Data)")
+    else:
+        fig = px.line(
+            df,
+            x="WEEK",
+            y="NULLS_PER_1K_ROWS",
+            color="SERIES",
+            markers=True,
+            title="Weekly Nulls per 1k Output Rows",
+            color_discrete_sequence=["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6"]
+        )
+    return apply_theme_to_fig(fig, theme)
+
+
+def environment_health_chart(df, theme="dark"):
+    px = _px()
+    if df.empty:
+        fig = px.bar(title="Pipeline Health Score by Environment (No Data)")
+    else:
+        fig = px.bar(
+            df,
+            x="PIPELINE_NAME",
+            y="HEALTH_SCORE",
+            color="ENVIRONMENT",
+            barmode="group",
+            title="Pipeline Health Score by Environment",
+            color_discrete_sequence=["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6"]
+        )
+    return apply_theme_to_fig(fig, theme)
+
+
+def critical_path_chart(df, theme="dark"):
+    px = _px()
+    if df.empty:
+        fig = px.bar(title="Critical Path Attribution (No Data)")
+    else:
+        fig = px.bar(
+            df,
+            x="MINUTES_PER_RUN",
+            y="PIPELINE_NAME",
+            color="JOB_NAME",
+            orientation="h",
+            title="Critical Path Attribution (Avg Minutes per Run)",
+            color_discrete_sequence=["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6", "#64748B"]
+        )
+    return apply_theme_to_fig(fig, theme)
@@ -0,0 +1,72 @@
+"""Headless pipeline health report.
+
+Computes the same KPIs, tables and charts as the dashboard without starting
+Streamlit and writes them to a static bundle, e.g. from cron:
+
+    0 6 * * * cd /opt/pipeline_health_dashboard && python export_report.py --output-dir reports/daily
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import streamlit.logger
+
+# The dashboard loaders' st.cache_data decorators warn at import time when there is no
+# Streamlit runtime; the export never calls them, so keep cron logs clean.
+streamlit.logger.get_logger("streamlit.runtime.caching.cache_data_api").setLevel("ERROR")
+
+from services.data_loader import get_session, query_all_frames
+from services.report_exporter import export_report
+from processing.transformations import prepare_dashboard_frames
+from processing.kpis import compute_dashboard_kpis
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export a static pipeline health report bundle.")
+    parser.add_argument(
+        "--output-dir",
+        default=os.path.join("reports", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
+        help="Directory to write report.html, kpis.json and tables/ into.",
+    )
+    parser.add_argument("--theme", choices=["light", "dark"], default="light")
+    parser.add_argument(
+        "--formats",
+        default="html,json,parquet",
+        help="Comma separated subset of html,json,parquet.",
+    )
+    parser.add_argument("--sla-threshold", type=int, default=60, help="SLA threshold in minutes.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    session = get_session()
+
+    try:
+        frames = query_all_frames(session)
+    except Exception as e:
+        print(f"Pipeline health report not exported: loading control tables failed: {e}", file=sys.stderr)
+        return 1
+
+    frames = prepare_dashboard_frames(frames, args.sla_threshold)
+    kpis = compute_dashboard_kpis(frames)
+    written = export_report(
+        frames,
+        kpis,
+        args.output_dir,
+        theme=args.theme,
+        formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+    )
+
+    mode = "Snowflake" if session is not None else "Local Simulation (SQLite)"
+    print(f"Pipeline health report exported ({mode}):")
+    for path in written:
+        print(f"  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
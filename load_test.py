@@ -0,0 +1,288 @@
+"""Local load test for the dashboard.
+
+Drives the full render path of streamlit_app.py for N simulated sessions
+(Streamlit AppTest) against the SQLite simulation DB and reports render
+latency percentiles, backend loads and memory per session, then measures
+how N concurrent cache misses and live polls in one process are collapsed:
+
+    python load_test.py --sessions 50 --backend-latency-ms 200 --sections all
+
+AppTest instances share Streamlit's process-wide Runtime, so each simulated
+session runs in its own process. Every process renders the page once with
+empty caches ("cold", the view right after the 600s TTL expires) and then
+reruns it --warm-rounds times against its own warm caches. Because those
+caches are not shared, the stampede is measured separately: N threads of
+this process call the cached loaders right after the cache is cleared, as
+the sessions of one server process do when the 600s TTL expires.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+# Toggle keys of the lazily loaded sections (see section_is_open in streamlit_app.py)
+SECTIONS = ["execution", "timeline", "drilldown", "volume", "outputs", "uniqueness", "integrity", "environments"]
+
+# Set in each worker process by _init_worker
+_start = None
+_ready = None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many concurrent dashboard sessions.")
+    parser.add_argument("--sessions", type=int, default=50, help="Simulated sessions (one process each).")
+    parser.add_argument("--concurrency", type=int, default=None, help="Sessions running at once (defaults to --sessions).")
+    parser.add_argument("--warm-rounds", type=int, default=1, help="Reruns per session after the cold render.")
+    parser.add_argument(
+        "--sections",
+        default="execution",
+        help="Comma separated sections to open, or 'all'. Default is the page as first opened."
+    )
+    parser.add_argument(
+        "--backend-latency-ms",
+        type=float,
+        default=0,
+        help="Artificial latency per SQLite query, to make backend timings realistic."
+    )
+    parser.add_argument("--timeout", type=float, default=120, help="Per-render timeout in seconds.")
+    parser.add_argument(
+        "--memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Track retained memory per session with tracemalloc (slows rendering)."
+    )
+    return parser.parse_args(argv)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _init_worker(start, ready):
+    global _start, _ready
+    _start, _ready = start, ready
+
+
+def _quiet_cache_warnings():
+    # AppTest and direct loader calls run without a Streamlit Runtime; st.cache_data warns on every call
+    import streamlit.logger
+    streamlit.logger.get_logger("streamlit.runtime.caching.cache_data_api").setLevel("ERROR")
+
+
+def _signal_ready():
+    with _ready.get_lock():
+        _ready.value += 1
+
+
+def render_session(sections, warm_rounds, timeout, memory):
+    # Runs in its own process; never raises, failures are returned as "error"
+    result = {"latencies": [], "loads": [], "errors": [], "memory_kb": None, "cache_kb": None}
+    ready_signalled = False
+    try:
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+        from utils.single_flight import FLIGHT_STATS, reset_flight_stats
+        _quiet_cache_warnings()
+
+        if memory:
+            # Throwaway render first, so modules the app imports on first use are not counted as session memory
+            AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        for section in sections:
+            at.session_state[f"show_{section}"] = True
+
+        # All sessions of the first wave are released together to reproduce the top-of-the-hour burst
+        _signal_ready()
+        ready_signalled = True
+        _start.wait()
+
+        for _ in range(warm_rounds + 1):
+            reset_flight_stats()
+            started = time.perf_counter()
+            at.run()
+            result["latencies"].append((time.perf_counter() - started) * 1000)
+            result["loads"].append(FLIGHT_STATS["executed"])
+            result["errors"].extend(str(e.value) for e in at.exception)
+
+        if memory:
+            retained = tracemalloc.get_traced_memory()[0] - baseline
+            # Caches are shared by all sessions of a real server process; report them apart
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            session_only = tracemalloc.get_traced_memory()[0] - baseline
+            tracemalloc.stop()
+            result["memory_kb"] = session_only / 1024
+            result["cache_kb"] = (retained - session_only) / 1024
+    except Exception as e:
+        result["errors"].append(f"{type(e).__name__}: {e}")
+    finally:
+        if not ready_signalled:
+            _signal_ready()
+    return result
+
+
+def run_sessions(args, sections):
+    ctx = multiprocessing.get_context("spawn")
+    start, ready = ctx.Event(), ctx.Value("i", 0)
+    concurrency = min(args.concurrency or args.sessions, args.sessions)
+
+    # A fresh process per session (maxtasksperchild=1): no Runtime or cache carries over
+    with ctx.Pool(concurrency, initializer=_init_worker, initargs=(start, ready), maxtasksperchild=1) as pool:
+        pending = [
+            pool.apply_async(render_session, (sections, args.warm_rounds, args.timeout, args.memory))
+            for _ in range(args.sessions)
+        ]
+        deadline = time.monotonic() + args.timeout
+        while ready.value < concurrency and time.monotonic() < deadline:
+            time.sleep(0.05)
+        started = time.perf_counter()
+        start.set()
+
+        results = []
+        for async_result in pending:
+            try:
+                results.append(async_result.get(timeout=args.timeout * (args.warm_rounds + 2)))
+            except Exception as e:
+                results.append({"latencies": [], "loads": [], "errors": [f"{type(e).__name__}: {e}"],
+                                "memory_kb": None, "cache_kb": None})
+        wall_ms = (time.perf_counter() - started) * 1000
+    return results, wall_ms
+
+
+def measure_stampede(callers, load):
+    # N threads of one process released together, like sessions of one server process
+    # hitting the same expired entry; backend queries are counted by single-flight
+    from utils.single_flight import FLIGHT_STATS, reset_flight_stats
+
+    reset_flight_stats()
+    start = threading.Event()
+    latencies, errors = [], []
+
+    def call():
+        start.wait()
+        started = time.perf_counter()
+        try:
+            load()
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    start.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "callers": callers,
+        "loads": FLIGHT_STATS["executed"],
+        "shared": FLIGHT_STATS["shared"],
+        "latencies": latencies,
+        "errors": errors,
+        "wall_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def measure_stampedes(callers):
+    _quiet_cache_warnings()
+    import streamlit as st
+    from services.data_loader import FRAME_LOADERS, load_frame, load_new_runs, query_control_table
+
+    # Cached path: every caller misses the cleared st.cache_data entries of all control tables
+    st.cache_data.clear()
+    cached = measure_stampede(callers, lambda: [load_frame(None, name) for name in FRAME_LOADERS])
+    cached.update(label="cached loaders", requests=callers * len(FRAME_LOADERS))
+
+    # Uncached path: live polls for the same watermark
+    watermark = int(query_control_table(None, "jobs")["RUN_ID"].max())
+    polls = measure_stampede(callers, lambda: load_new_runs(None, "jobs", watermark))
+    polls.update(label="live polls", requests=callers)
+    return [cached, polls]
+
+
+def print_report(args, sections, results, wall_ms, stampedes):
+    print(f"\nLoad test: {args.sessions} sessions (one process each) • sections: {', '.join(sections)} • "
+          f"backend latency {args.backend_latency_ms:.0f} ms • wall {wall_ms:,.0f} ms")
+    header = f"{'render':<8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}{'loads/sess':>12}"
+    print(header)
+    print("-" * len(header))
+    for i in range(args.warm_rounds + 1):
+        lat = [r["latencies"][i] for r in results if len(r["latencies"]) > i]
+        loads = [r["loads"][i] for r in results if len(r["loads"]) > i]
+        label = "cold" if i == 0 else f"warm{i}"
+        if not lat:
+            print(f"{label:<8}{'no successful renders':>45}")
+            continue
+        print(
+            f"{label:<8}"
+            + "".join(f"{percentile(lat, p):>9.0f}" for p in (50, 90, 95, 99))
+            + f"{max(lat):>9.0f}{sum(loads) / len(loads):>12.1f}"
+        )
+
+    failed = [r for r in results if r["errors"]]
+    print(f"\nSessions with errors: {len(failed)} of {len(results)}")
+    for r in failed[:5]:
+        print(f"  - {r['errors'][0]}")
+
+    memory = [r["memory_kb"] for r in results if r["memory_kb"] is not None]
+    if memory:
+        cache = [r["cache_kb"] for r in results if r["cache_kb"] is not None]
+        print(f"Memory per session: {sum(memory) / len(memory):,.0f} KB "
+              f"(plus {sum(cache) / len(cache):,.0f} KB of cache, shared by all sessions of a server process)")
+    print("Each session process has its own cache, so 'loads/sess' of the cold render is one session's "
+          "full load, not the shared-cache stampede below.")
+
+    print(f"\nStampede in one server process ({args.sessions} concurrent callers, cold caches)")
+    header = f"{'path':<16}{'requests':>10}{'loads':>7}{'joined':>8}{'p50':>9}{'max':>9}{'wall':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in stampedes:
+        lat = r["latencies"]
+        print(
+            f"{r['label']:<16}{r['requests']:>10}{r['loads']:>7}{r['shared']:>8}"
+            f"{percentile(lat, 50):>9.0f}{max(lat):>9.0f}{r['wall_ms']:>9.0f}{len(r['errors']):>8}"
+        )
+    print("\nLatencies in ms. 'loads' = backend queries executed; 'joined' = callers served by an in-flight\n"
+          "query through single-flight. Cached loaders are collapsed by st.cache_data's per-key lock before\n"
+          "single-flight is reached; single-flight collapses the uncached live polls.")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sections = SECTIONS if args.sections == "all" else [s.strip() for s in args.sections.split(",") if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        print(f"Unknown sections: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    # Must be set before the data loader is imported; spawned sessions inherit it
+    os.environ["PIPELINE_HEALTH_SIMULATION_LATENCY_MS"] = str(args.backend_latency_ms)
+
+    results, wall_ms = run_sessions(args, sections)
+    stampedes = measure_stampedes(args.sessions)
+
+    print_report(args, sections, results, wall_ms, stampedes)
+    return 1 if any(r["errors"] for r in results + stampedes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from processing.transformations import prepare_frame
+from utils.scoring import compute_health_score
+
+
+def combine_environment_frames(frames_by_env, name):
+    # Every frame already carries its ENVIRONMENT tag from the loader
+    frames = [prepare_frame(name, env_frames[name]) for env_frames in frames_by_env.values() if name in env_frames]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def environment_health(frames_by_env, keys=("ENVIRONMENT",)):
+    keys = list(keys)
+    jobs = combine_environment_frames(frames_by_env, "jobs")
+    if jobs.empty:
+        return pd.DataFrame(columns=keys + ["RUNS", "SUCCESS_RATE", "SLA_COMPLIANCE", "QUALITY_SCORE", "NULL_COUNT", "HEALTH_SCORE"])
+
+    health = jobs.assign(
+        PASSED=jobs["STATUS"] == "PASS",
+        WITHIN_SLA=~jobs["SLA_BREACH"].astype(bool)
+    ).groupby(keys).agg(
+        SUCCESS_RATE=("PASSED", "mean"),
+        SLA_COMPLIANCE=("WITHIN_SLA", "mean"),
+    )
+    # A run is a (PIPELINE_NAME, RUN_ID) pair; pipelines can reuse each other's RUN_IDs
+    run_keys = list(dict.fromkeys(keys + ["PIPELINE_NAME", "RUN_ID"]))
+    health.insert(0, "RUNS", jobs.drop_duplicates(run_keys).groupby(keys).size())
+
+    uniqueness = combine_environment_frames(frames_by_env, "uniqueness")
+    if not uniqueness.empty:
+        within = uniqueness["DUPLICATE_PERCENTAGE"] <= uniqueness["DUPLICATE_THRESHOLD"]
+        health["QUALITY_SCORE"] = uniqueness.assign(WITHIN=within).groupby(keys)["WITHIN"].mean()
+    else:
+        health["QUALITY_SCORE"] = float("nan")
+
+    integrity = combine_environment_frames(frames_by_env, "integrity")
+    if not integrity.empty:
+        health["NULL_COUNT"] = integrity.groupby(keys)["NULL_COUNT"].sum()
+    else:
+        health["NULL_COUNT"] = 0
+
+    for col in ["SUCCESS_RATE", "SLA_COMPLIANCE", "QUALITY_SCORE"]:
+        health[col] = (health[col] * 100).round(2)
+    health["NULL_COUNT"] = health["NULL_COUNT"].fillna(0).astype(int)
+    health["HEALTH_SCORE"] = compute_health_score(
+        health["SUCCESS_RATE"], health["SLA_COMPLIANCE"], health["QUALITY_SCORE"]
+    )
+    return health.reset_index()
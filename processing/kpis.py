@@ -0,0 +1,50 @@
+# Plain-Python KPI calculations so the UI and headless exports report identical numbers
+
+
+def execution_kpis(df_jobs):
+    if df_jobs.empty:
+        return {}
+    return {
+        "distinct_pipelines": int(df_jobs["PIPELINE_NAME"].nunique()),
+        "total_runs": int(len(df_jobs)),
+        "success_runs": int((df_jobs["STATUS"] == "PASS").sum()),
+        "fail_runs": int((df_jobs["STATUS"] == "FAIL").sum()),
+        "sla_breaches": int(df_jobs["SLA_BREACH"].sum()),
+    }
+
+
+def volume_kpis(df_sources):
+    if df_sources.empty:
+        return {}
+    return {
+        "total_rows": int(df_sources["ROW_COUNT"].sum()),
+        "total_gb": float(df_sources["BYTES"].sum() / (1024**3)),
+    }
+
+
+def duplicate_breaches(df_uniqueness):
+    if df_uniqueness.empty:
+        return df_uniqueness
+    return df_uniqueness[df_uniqueness["DUPLICATE_PERCENTAGE"] > df_uniqueness["DUPLICATE_THRESHOLD"]]
+
+
+def uniqueness_kpis(df_uniqueness):
+    if df_uniqueness.empty:
+        return {}
+    return {"duplicate_breaches": int(len(duplicate_breaches(df_uniqueness)))}
+
+
+def integrity_kpis(df_integrity):
+    if df_integrity.empty:
+        return {}
+    return {"total_nulls": int(df_integrity["NULL_COUNT"].sum())}
+
+
+def compute_dashboard_kpis(frames):
+    return {
+        "execution": execution_kpis(frames["jobs"]),
+        "volume": volume_kpis(frames["sources"]),
+        "output": {"sink_loads": int(len(frames["outputs"]))},
+        "uniqueness": uniqueness_kpis(frames["uniqueness"]),
+        "integrity": integrity_kpis(frames["integrity"]),
+    }
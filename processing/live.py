@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from processing.kpis import compute_dashboard_kpis
+from processing.quality import build_quality_rollups, update_quality_rollups
+
+# Live mode keeps one state dict per browser session. Each table is polled from its
+# RUN_ID watermark inclusively, so rows written late for the newest run are still
+# picked up. Rows of that run are matched to the ones already counted on the table's
+# natural key: unseen keys are added, and a row that changed since (e.g. a job that
+# finished) has its old version retracted before the new one is added.
+# Only counters, rollups and the watermark run's rows are kept, never the history.
+
+NATURAL_KEYS = {
+    "jobs": ["PIPELINE_NAME", "RUN_ID", "JOB_NAME"],
+    "sources": ["PIPELINE_NAME", "RUN_ID", "SOURCE_TABLE"],
+    "outputs": ["PIPELINE_NAME", "RUN_ID", "SINK_TABLE"],
+    "uniqueness": ["PIPELINE_NAME", "RUN_ID", "SINK_TABLE"],
+    "integrity": ["PIPELINE_NAME", "RUN_ID"],
+}
+
+
+def max_run_id(df, default=0):
+    if df.empty or "RUN_ID" not in df.columns:
+        return default
+    return int(pd.to_numeric(df["RUN_ID"]).max())
+
+
+def run_rows(df, run_id):
+    if df.empty:
+        return df
+    return df[(pd.to_numeric(df["RUN_ID"]) == run_id).to_numpy()]
+
+
+def _keys(df, keys):
+    # RUN_ID is int or float depending on NULLs elsewhere in the load
+    return df[keys].assign(RUN_ID=pd.to_numeric(df["RUN_ID"]).astype("int64")).reset_index(drop=True)
+
+
+def same_values(previous, current):
+    # Value by value rather than by row hash: an int column read as float (5 vs 5.0)
+    # because of a NULL elsewhere in a load is still the same row
+    same = np.ones(len(current), dtype=bool)
+    for col in current.columns.intersection(previous.columns):
+        a = previous[col].to_numpy(dtype=object)
+        b = current[col].to_numpy(dtype=object)
+        same &= (a == b) | (pd.isna(a) & pd.isna(b))
+    return same
+
+
+def split_revisions(seen, df, keys):
+    # Returns the rows with unseen keys, plus the previous and current version of rows that changed
+    if seen.empty or df.empty:
+        return df, seen.iloc[0:0], df.iloc[0:0]
+    position = _keys(df, keys).merge(
+        _keys(seen, keys).assign(_SEEN=np.arange(len(seen))), on=keys, how="left"
+    )["_SEEN"].to_numpy()
+    is_new = np.isnan(position)
+    previous = seen.iloc[position[~is_new].astype(int)]
+    current = df[~is_new]
+    revised = ~same_values(previous, current)
+    return df[is_new], previous[revised], current[revised]
+
+
+def merge_kpis(kpis, delta):
+    merged = {section: dict(values) for section, values in kpis.items()}
+    for section, values in delta.items():
+        target = merged.setdefault(section, {})
+        for key, value in values.items():
+            target[key] = target.get(key, 0) + value
+    return merged
+
+
+def _concat(first, second):
+    # Skips empty parts so their dtypes do not leak into the result
+    if first.empty:
+        return second
+    if second.empty:
+        return first
+    return pd.concat([first, second])
+
+
+def negate_kpis(kpis):
+    return {section: {key: -value for key, value in values.items()} for section, values in kpis.items()}
+
+
+def init_live_state(frames):
+    pipelines = set(frames["jobs"]["PIPELINE_NAME"]) if not frames["jobs"].empty else set()
+    kpis = compute_dashboard_kpis(frames)
+    kpis.setdefault("execution", {})["distinct_pipelines"] = len(pipelines)
+    last_run_id = {name: max_run_id(df) for name, df in frames.items()}
+    return {
+        # Empty frames with the loaded schema, used to fill tables missing from a poll
+        "templates": {name: df.iloc[0:0] for name, df in frames.items()},
+        "last_run_id": last_run_id,
+        # Rows of the watermark run as last counted, to match the next poll against
+        "watermark_rows": {name: run_rows(df, last_run_id[name]) for name, df in frames.items()},
+        "kpis": kpis,
+        "quality": build_quality_rollups(frames),
+        "last_delta": {},
+        "pipelines": pipelines,
+        "polls": 0,
+    }
+
+
+def apply_new_runs(state, polled_frames):
+    # Returns the pipelines touched by this poll, the rows with new keys and the
+    # (previous, current) versions of rows revised in place, so callers can update
+    # only the affected traces
+    state["polls"] += 1
+    new_frames, added_frames, removed_frames, revised = {}, {}, {}, {}
+    for name, df in polled_frames.items():
+        if df.empty:
+            continue
+        watermark = state["last_run_id"][name]
+        at_watermark = (pd.to_numeric(df["RUN_ID"]) == watermark).to_numpy()
+        added, previous, current = split_revisions(state["watermark_rows"][name], df[at_watermark], NATURAL_KEYS[name])
+
+        # The poll holds every row of the runs it returns, so it replaces the kept watermark rows
+        state["last_run_id"][name] = max_run_id(df, watermark)
+        state["watermark_rows"][name] = run_rows(df, state["last_run_id"][name])
+
+        added = _concat(added, df[~at_watermark])
+        if not added.empty:
+            added_frames[name] = added
+        if not current.empty:
+            new_frames[name] = _concat(added, current)
+            removed_frames[name] = previous
+            revised[name] = (previous, current)
+        elif not added.empty:
+            new_frames[name] = added
+
+    if not new_frames:
+        state["last_delta"] = {}
+        return set(), {}, {}
+
+    changed = set()
+    for df in new_frames.values():
+        changed.update(df["PIPELINE_NAME"])
+
+    delta_frames = {**state["templates"], **new_frames}
+    removed = {**state["templates"], **removed_frames}
+    state["quality"] = update_quality_rollups(state["quality"], delta_frames, removed)
+    delta = merge_kpis(compute_dashboard_kpis(delta_frames), negate_kpis(compute_dashboard_kpis(removed)))
+    state["pipelines"].update(new_frames["jobs"]["PIPELINE_NAME"] if "jobs" in new_frames else [])
+    delta.get("execution", {}).pop("distinct_pipelines", None)
+
+    state["kpis"] = merge_kpis(state["kpis"], delta)
+    state["kpis"].setdefault("execution", {})["distinct_pipelines"] = len(state["pipelines"])
+    state["last_delta"] = delta
+    return changed, added_frames, revised
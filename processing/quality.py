@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from processing.transformations import add_week_period
+
+# Weekly data-quality rollups per pipeline and sink. Only additive (or max)
+# measures are stored so new runs can be folded in without rescanning history;
+# averages and rates are derived from them when read.
+
+ROLLUP_KEYS = ["PIPELINE_NAME", "SINK_TABLE", "WEEK"]
+
+DUPLICATE_SUMS = ["RUNS", "DUPLICATE_COUNT", "DUPLICATE_PERCENTAGE_SUM", "BREACH_COUNT"]
+DUPLICATE_MAXES = ["MAX_DUPLICATE_PERCENTAGE", "DUPLICATE_THRESHOLD"]
+NULL_SUMS = ["RUNS", "NULL_COUNT", "OUTPUT_ROWS"]
+
+
+def _empty_rollup(columns):
+    return pd.DataFrame(columns=ROLLUP_KEYS + columns)
+
+
+def duplicate_rollup(df_uniqueness):
+    if df_uniqueness.empty:
+        return _empty_rollup(DUPLICATE_SUMS + DUPLICATE_MAXES)
+    df = add_week_period(df_uniqueness.copy(), "PIPELINE_START_TIME")
+    df["BREACH"] = df["DUPLICATE_PERCENTAGE"] > df["DUPLICATE_THRESHOLD"]
+    return df.groupby(ROLLUP_KEYS, as_index=False).agg(
+        RUNS=("RUN_ID", "size"),
+        DUPLICATE_COUNT=("DUPLICATE_COUNT", "sum"),
+        DUPLICATE_PERCENTAGE_SUM=("DUPLICATE_PERCENTAGE", "sum"),
+        BREACH_COUNT=("BREACH", "sum"),
+        MAX_DUPLICATE_PERCENTAGE=("DUPLICATE_PERCENTAGE", "max"),
+        DUPLICATE_THRESHOLD=("DUPLICATE_THRESHOLD", "max"),
+    )
+
+
+# Nulls are reported per run, not per sink: output rows are summed per run before the
+# join so a run writing to several sinks is counted once. The run-grain facts are kept
+# next to the rollup so later polls can re-aggregate the runs they touch.
+RUN_KEYS = ["RUN_ID", "PIPELINE_NAME"]
+
+
+def null_run_facts(df_integrity):
+    if df_integrity.empty:
+        return pd.DataFrame(columns=RUN_KEYS + ["WEEK", "NULL_COUNT"])
+    df = add_week_period(df_integrity.copy(), "PIPELINE_START_TIME")
+    return df.groupby(RUN_KEYS, as_index=False).agg(WEEK=("WEEK", "first"), NULL_COUNT=("NULL_COUNT", "sum"))
+
+
+def output_sink_facts(df_outputs):
+    if df_outputs.empty:
+        return pd.DataFrame(columns=RUN_KEYS + ["SINK_TABLE", "ROW_COUNT"])
+    return df_outputs.groupby(RUN_KEYS + ["SINK_TABLE"], as_index=False)["ROW_COUNT"].sum()
+
+
+def _output_run_facts(output_sinks):
+    if output_sinks.empty:
+        return pd.DataFrame(columns=RUN_KEYS + ["SINK_TABLE", "OUTPUT_ROWS"])
+    return output_sinks.sort_values("SINK_TABLE").groupby(RUN_KEYS, as_index=False).agg(
+        SINK_TABLE=("SINK_TABLE", ", ".join),
+        OUTPUT_ROWS=("ROW_COUNT", "sum"),
+    )
+
+
+def _null_rollup_from_facts(null_runs, output_sinks):
+    if null_runs.empty:
+        return _empty_rollup(NULL_SUMS)
+    df = null_runs.merge(_output_run_facts(output_sinks), on=RUN_KEYS, how="left")
+    df["SINK_TABLE"] = df["SINK_TABLE"].fillna("UNMATCHED")
+    df["OUTPUT_ROWS"] = df["OUTPUT_ROWS"].fillna(0)
+    return df.groupby(ROLLUP_KEYS, as_index=False).agg(
+        RUNS=("RUN_ID", "size"),
+        NULL_COUNT=("NULL_COUNT", "sum"),
+        OUTPUT_ROWS=("OUTPUT_ROWS", "sum"),
+    )
+
+
+def null_rollup(df_integrity, df_outputs):
+    return _null_rollup_from_facts(null_run_facts(df_integrity), output_sink_facts(df_outputs))
+
+
+def _for_runs(facts, runs):
+    return facts.merge(runs, on=RUN_KEYS) if not facts.empty else facts
+
+
+def _without_runs(facts, runs):
+    if facts.empty:
+        return facts
+    marked = facts.merge(runs.assign(_AFFECTED=True), on=RUN_KEYS, how="left")
+    return facts[marked["_AFFECTED"].isna().to_numpy()]
+
+
+def merge_rollups(existing, delta, sums, maxes=()):
+    # Cost is proportional to the rollup size plus the delta, never the raw history
+    if delta.empty:
+        return existing
+    if existing.empty:
+        return delta
+    aggs = {col: "sum" for col in sums}
+    aggs.update({col: "max" for col in maxes})
+    return pd.concat([existing, delta], ignore_index=True).groupby(ROLLUP_KEYS, as_index=False).agg(aggs)
+
+
+def build_quality_rollups(frames):
+    null_runs = null_run_facts(frames["integrity"])
+    output_sinks = output_sink_facts(frames["outputs"])
+    return {
+        "duplicates": duplicate_rollup(frames["uniqueness"]),
+        "nulls": _null_rollup_from_facts(null_runs, output_sinks),
+        "null_runs": null_runs,
+        "output_sinks": output_sinks,
+    }
+
+
+def _retracted(rollup, sums, maxes=()):
+    # Negated sums; maxes are left empty since a maximum cannot be taken back
+    return rollup.assign(**{col: -rollup[col] for col in sums}, **{col: np.nan for col in maxes})
+
+
+def update_quality_rollups(rollups, new_frames, removed_frames=None):
+    # removed_frames holds the previous version of rows that were revised in place;
+    # their contribution is taken out before the new version is added
+    removed_frames = removed_frames or {name: df.iloc[0:0] for name, df in new_frames.items()}
+    updated = dict(rollups)
+    duplicates = merge_rollups(
+        rollups["duplicates"], duplicate_rollup(new_frames["uniqueness"]), DUPLICATE_SUMS, DUPLICATE_MAXES
+    )
+    removed_duplicates = duplicate_rollup(removed_frames["uniqueness"])
+    if not removed_duplicates.empty:
+        # A revised row keeps its week's old peak percentage until the next full load
+        duplicates = merge_rollups(
+            duplicates, _retracted(removed_duplicates, DUPLICATE_SUMS, DUPLICATE_MAXES), DUPLICATE_SUMS, DUPLICATE_MAXES
+        )
+        duplicates = duplicates[duplicates["RUNS"] > 0].reset_index(drop=True)
+    updated["duplicates"] = duplicates
+
+    removed_null_runs = null_run_facts(removed_frames["integrity"])
+    removed_null_runs["NULL_COUNT"] = -removed_null_runs["NULL_COUNT"]
+    removed_output_sinks = output_sink_facts(removed_frames["outputs"])
+    removed_output_sinks["ROW_COUNT"] = -removed_output_sinks["ROW_COUNT"]
+    new_null_runs = pd.concat([removed_null_runs, null_run_facts(new_frames["integrity"])], ignore_index=True)
+    new_output_sinks = pd.concat([removed_output_sinks, output_sink_facts(new_frames["outputs"])], ignore_index=True)
+    affected = pd.concat([new_null_runs[RUN_KEYS], new_output_sinks[RUN_KEYS]], ignore_index=True).drop_duplicates()
+    if affected.empty:
+        return updated
+
+    # Re-aggregate only the affected runs: retract their old contribution, add the new one.
+    # This also re-files nulls whose output rows arrive in a later poll than the integrity row.
+    before = _null_rollup_from_facts(_for_runs(rollups["null_runs"], affected), _for_runs(rollups["output_sinks"], affected))
+
+    touched_nulls = pd.concat([_for_runs(rollups["null_runs"], affected), new_null_runs], ignore_index=True)
+    # The latest version of a run decides its week
+    touched_nulls = touched_nulls.groupby(RUN_KEYS, as_index=False).agg(WEEK=("WEEK", "last"), NULL_COUNT=("NULL_COUNT", "sum"))
+    touched_sinks = pd.concat([_for_runs(rollups["output_sinks"], affected), new_output_sinks], ignore_index=True)
+    touched_sinks = touched_sinks.groupby(RUN_KEYS + ["SINK_TABLE"], as_index=False)["ROW_COUNT"].sum()
+
+    after = _null_rollup_from_facts(touched_nulls, touched_sinks)
+    nulls = merge_rollups(rollups["nulls"], before.assign(**{col: -before[col] for col in NULL_SUMS}), NULL_SUMS)
+    nulls = merge_rollups(nulls, after, NULL_SUMS)
+
+    updated["nulls"] = nulls[nulls["RUNS"] > 0].reset_index(drop=True)
+    updated["null_runs"] = pd.concat([_without_runs(rollups["null_runs"], affected), touched_nulls], ignore_index=True)
+    updated["output_sinks"] = pd.concat([_without_runs(rollups["output_sinks"], affected), touched_sinks], ignore_index=True)
+    return updated
+
+
+def duplicate_trends(rollup):
+    trends = rollup.sort_values("WEEK").copy()
+    trends["AVG_DUPLICATE_PERCENTAGE"] = trends["DUPLICATE_PERCENTAGE_SUM"] / trends["RUNS"]
+    trends["SERIES"] = trends["PIPELINE_NAME"] + " · " + trends["SINK_TABLE"]
+    return trends
+
+
+def null_trends(rollup):
+    trends = rollup.sort_values("WEEK").copy()
+    rows = trends["OUTPUT_ROWS"].astype(float).replace(0, np.nan)
+    trends["NULLS_PER_1K_ROWS"] = trends["NULL_COUNT"] / rows * 1000
+    trends["SERIES"] = trends["PIPELINE_NAME"] + " · " + trends["SINK_TABLE"]
+    return trends
+
+
+def breach_count(rollup):
+    return int(rollup["BREACH_COUNT"].sum()) if not rollup.empty else 0
+
+
+def breaches_by_pipeline(rollup):
+    if rollup.empty:
+        return pd.DataFrame(columns=["PIPELINE_NAME", "SINK_TABLE", "BREACH_COUNT", "RUNS"])
+    return rollup.groupby(["PIPELINE_NAME", "SINK_TABLE"], as_index=False)[["BREACH_COUNT", "RUNS"]].sum()
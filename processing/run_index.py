@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+# Each frame is sorted once by RUN_ID; a run lookup is then two binary searches
+# plus a contiguous slice instead of a boolean mask over the full frame.
+
+
+def build_frame_index(df):
+    if df.empty:
+        return {"frame": df, "keys": np.array([], dtype="int64")}
+    run_ids = pd.to_numeric(df["RUN_ID"]).to_numpy()
+    order = np.argsort(run_ids, kind="stable")
+    return {"frame": df.iloc[order].reset_index(drop=True), "keys": run_ids[order]}
+
+
+def lookup_frame(frame_index, run_id):
+    keys = frame_index["keys"]
+    lo = np.searchsorted(keys, run_id, side="left")
+    hi = np.searchsorted(keys, run_id, side="right")
+    return frame_index["frame"].iloc[lo:hi]
+
+
+def build_run_index(frames):
+    frame_indexes = {name: build_frame_index(df) for name, df in frames.items()}
+
+    runs_by_pipeline = {}
+    run_keys = [df[["PIPELINE_NAME", "RUN_ID"]] for df in frames.values() if not df.empty]
+    if run_keys:
+        runs = pd.concat(run_keys, ignore_index=True)
+        runs = runs.assign(RUN_ID=pd.to_numeric(runs["RUN_ID"])).drop_duplicates()
+        runs_by_pipeline = {
+            pipeline: sorted(group["RUN_ID"].astype(int), reverse=True)
+            for pipeline, group in runs.groupby("PIPELINE_NAME")
+        }
+
+    return {"frames": frame_indexes, "runs_by_pipeline": runs_by_pipeline}
+
+
+def lookup_run(run_index, pipeline, run_id):
+    detail = {}
+    for name, frame_index in run_index["frames"].items():
+        rows = lookup_frame(frame_index, run_id)
+        # The slice is already tiny, so the pipeline check is cheap
+        detail[name] = rows[rows["PIPELINE_NAME"] == pipeline] if not rows.empty else rows
+    return detail
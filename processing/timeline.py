@@ -0,0 +1,93 @@
+import pandas as pd
+
+# Run timelines from DIM_PIPELINE_JOB_TIMELINESS.
+#
+# Jobs of a run are ordered by start time and walked against a "frontier": the
+# latest END_TIME seen so far (starting at PIPELINE_START_TIME). A job that
+# starts after the frontier leaves an idle gap; the part of a job that pushes
+# the frontier forward is its critical-path time. Per run,
+#   QUEUE + IDLE + CRITICAL_PATH == last END_TIME - PIPELINE_START_TIME,
+# and everything is computed with grouped cummax/shift, no per-run Python loop.
+
+TIMELINE_COLUMNS = ["PIPELINE_NAME", "RUN_ID", "JOB_NAME", "PIPELINE_START_TIME", "JOB_START_TIME", "END_TIME"]
+
+# A run is identified by pipeline and RUN_ID, as in the drill-down index
+RUN_KEYS = ["PIPELINE_NAME", "RUN_ID"]
+
+
+def _minutes(delta):
+    return delta.dt.total_seconds() / 60
+
+
+def compute_job_timeline(df_jobs):
+    if df_jobs.empty:
+        return pd.DataFrame(columns=TIMELINE_COLUMNS + ["QUEUE_MINUTES", "IDLE_MINUTES", "CRITICAL_MINUTES", "ON_CRITICAL_PATH"])
+
+    # Jobs still running (no END_TIME yet) have no interval to place on the timeline
+    df = df_jobs[TIMELINE_COLUMNS].dropna(subset=["JOB_START_TIME", "END_TIME"])
+    df = df.sort_values(RUN_KEYS + ["JOB_START_TIME", "END_TIME"], kind="stable").reset_index(drop=True)
+    run_keys = [df[key] for key in RUN_KEYS]
+    runs = df.groupby(run_keys, sort=False)
+
+    # Frontier before each job: running max END_TIME of the earlier jobs, else the pipeline start
+    frontier = runs["END_TIME"].cummax().groupby(run_keys, sort=False).shift(1)
+    first_job = frontier.isna()
+    frontier = frontier.fillna(df["PIPELINE_START_TIME"])
+
+    wait = _minutes(df["JOB_START_TIME"] - frontier).clip(lower=0)
+    df["QUEUE_MINUTES"] = wait.where(first_job, 0.0)
+    df["IDLE_MINUTES"] = wait.where(~first_job, 0.0)
+    df["CRITICAL_MINUTES"] = _minutes(df["END_TIME"] - df["JOB_START_TIME"].where(df["JOB_START_TIME"] > frontier, frontier)).clip(lower=0)
+    df["ON_CRITICAL_PATH"] = df["CRITICAL_MINUTES"] > 0
+    return df
+
+
+def compute_run_timelines(job_timeline):
+    if job_timeline.empty:
+        return pd.DataFrame(columns=[
+            "PIPELINE_NAME", "RUN_ID", "JOBS", "WALL_CLOCK_MINUTES", "CRITICAL_PATH_MINUTES",
+            "IDLE_MINUTES", "QUEUE_MINUTES", "BUSY_MINUTES", "BOTTLENECK_JOB"
+        ])
+
+    busy = _minutes(job_timeline["END_TIME"] - job_timeline["JOB_START_TIME"]).clip(lower=0)
+    runs = job_timeline.assign(
+        BUSY_MINUTES=busy,
+        # NaN-safe ranking for the bottleneck lookup
+        CRITICAL_RANK=job_timeline["CRITICAL_MINUTES"].fillna(-1)
+    ).groupby(RUN_KEYS, sort=False)
+    summary = runs.agg(
+        JOBS=("JOB_NAME", "size"),
+        PIPELINE_START_TIME=("PIPELINE_START_TIME", "first"),
+        LAST_END_TIME=("END_TIME", "max"),
+        CRITICAL_PATH_MINUTES=("CRITICAL_MINUTES", "sum"),
+        IDLE_MINUTES=("IDLE_MINUTES", "sum"),
+        QUEUE_MINUTES=("QUEUE_MINUTES", "sum"),
+        BUSY_MINUTES=("BUSY_MINUTES", "sum"),
+    )
+    summary["WALL_CLOCK_MINUTES"] = _minutes(summary["LAST_END_TIME"] - summary["PIPELINE_START_TIME"])
+    summary["BOTTLENECK_JOB"] = job_timeline.loc[runs["CRITICAL_RANK"].idxmax(), "JOB_NAME"].to_numpy()
+    return summary.drop(columns=["LAST_END_TIME"]).reset_index()
+
+
+def critical_path_attribution(job_timeline):
+    # Average minutes per run each job (plus idle/queue time) adds to a pipeline's wall clock
+    if job_timeline.empty:
+        return pd.DataFrame(columns=["PIPELINE_NAME", "JOB_NAME", "MINUTES_PER_RUN", "SHARE_OF_WALL_CLOCK", "RUNS_ON_CRITICAL_PATH"])
+
+    runs_per_pipeline = job_timeline.groupby("PIPELINE_NAME")["RUN_ID"].nunique()
+    jobs = job_timeline.groupby(["PIPELINE_NAME", "JOB_NAME"]).agg(
+        MINUTES=("CRITICAL_MINUTES", "sum"),
+        RUNS_ON_CRITICAL_PATH=("ON_CRITICAL_PATH", "sum"),
+    ).reset_index()
+    waits = job_timeline.groupby("PIPELINE_NAME").agg(
+        IDLE=("IDLE_MINUTES", "sum"),
+        QUEUE=("QUEUE_MINUTES", "sum"),
+    ).reset_index().melt(id_vars="PIPELINE_NAME", var_name="JOB_NAME", value_name="MINUTES")
+    waits["JOB_NAME"] = waits["JOB_NAME"].map({"IDLE": "⏳ Idle Gaps", "QUEUE": "⏳ Queue Before First Job"})
+    waits["RUNS_ON_CRITICAL_PATH"] = 0
+
+    attribution = pd.concat([jobs, waits], ignore_index=True)
+    attribution["MINUTES_PER_RUN"] = attribution["MINUTES"] / attribution["PIPELINE_NAME"].map(runs_per_pipeline)
+    totals = attribution.groupby("PIPELINE_NAME")["MINUTES"].transform("sum")
+    attribution["SHARE_OF_WALL_CLOCK"] = (attribution["MINUTES"] / totals.where(totals > 0) * 100).round(2)
+    return attribution.drop(columns=["MINUTES"]).sort_values(["PIPELINE_NAME", "MINUTES_PER_RUN"], ascending=[True, False])
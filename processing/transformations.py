@@ -37,3 +37,25 @@ def map_execution_status(df):
         lambda x: "PASS" if str(x).upper().strip() == "SUCCESS" else "FAIL"
     )
     return df
+
+
+def prepare_job_timeliness(df, sla_threshold=60):
+    df = standardize_datetimes(df, ["PIPELINE_START_TIME", "JOB_START_TIME", "END_TIME"])
+    df = calculate_duration_minutes(df)
+    df = detect_sla_breach(df, sla_threshold)
+    df = add_week_period(df, "PIPELINE_START_TIME")
+    df = map_execution_status(df)
+    return df
+
+
+def prepare_frame(name, df, sla_threshold=60):
+    if name == "jobs":
+        return prepare_job_timeliness(df, sla_threshold)
+    if name in ("sources", "uniqueness", "integrity"):
+        return standardize_datetimes(df, ["PIPELINE_START_TIME"])
+    return df
+
+
+def prepare_dashboard_frames(frames, sla_threshold=60):
+    # Shared by the Streamlit UI and the headless report export
+    return {name: prepare_frame(name, df, sla_threshold) for name, df in frames.items()}
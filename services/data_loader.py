@@ -1,142 +1,258 @@
 
+import json
+import os
+import pathlib
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-def get_local_connection():
-    return sqlite3.connect("local_simulation.db")
+from utils.single_flight import single_flight
+from utils.timing import elapsed_ms, timed_import
 
-@st.cache_data(ttl=600)
-def load_job_timeliness(_session):
+# Resolved from the project root so headless/cron runs work from any working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCAL_DB_PATH = os.path.join(PROJECT_ROOT, "local_simulation.db")
+
+# Optional artificial latency for the SQLite simulation, so load tests see realistic backend timings
+SIMULATION_LATENCY_MS = float(os.environ.get("PIPELINE_HEALTH_SIMULATION_LATENCY_MS", "0"))
+
+# Control tables keyed by the frame names used across the app
+CONTROL_SCHEMA = "DB_RETAIL_PRD.CONTROL"
+CONTROL_TABLES = {
+    "jobs": ("DIM_PIPELINE_JOB_TIMELINESS", [
+        "PIPELINE_NAME", "RUN_ID", "JOB_NAME", "JOB_START_TIME",
+        "END_TIME", "EXECUTION_STATUS", "PIPELINE_START_TIME"
+    ]),
+    "sources": ("DIM_PIPELINE_CONTROL_SOURCE", [
+        "RUN_ID", "PIPELINE_NAME", "SOURCE_TABLE",
+        "PIPELINE_START_TIME", "ROW_COUNT", "BYTES"
+    ]),
+    "outputs": ("DIM_PIPELINE_CONTROL_OUTPUT_COMPLETENESS", [
+        "RUN_ID", "PIPELINE_NAME", "SINK_TABLE", "ROW_COUNT"
+    ]),
+    "uniqueness": ("DIM_PIPELINE_CONTROL_UNIQUENESS", [
+        "RUN_ID", "PIPELINE_NAME", "PIPELINE_START_TIME", "SINK_TABLE",
+        "DUPLICATE_COUNT", "DUPLICATE_PERCENTAGE", "DUPLICATE_THRESHOLD"
+    ]),
+    "integrity": ("DIM_PIPELINE_CONTROL_INTEGRITY", [
+        "RUN_ID", "PIPELINE_NAME", "PIPELINE_START_TIME", "NULL_COUNT"
+    ]),
+}
+
+def get_session():
+    # Snowpark is imported lazily; outside Snowflake there is no active session -> SQLite simulation
     try:
-        # 1. Try Snowflake
-        if _session:
-            return _session.sql("""
-                SELECT
-                    PIPELINE_NAME,
-                    RUN_ID,
-                    JOB_NAME,
-                    JOB_START_TIME,
-                    END_TIME,
-                    EXECUTION_STATUS,
-                    PIPELINE_START_TIME
-                FROM DB_RETAIL_PRD.CONTROL.DIM_PIPELINE_JOB_TIMELINESS
-            """).to_pandas()
-        
-        # 2. Try Local SQLite (Simulation Mode)
-        else:
-            conn = get_local_connection()
-            df = pd.read_sql("SELECT * FROM DIM_PIPELINE_JOB_TIMELINESS", conn)
-            conn.close()
-            return df
+        return timed_import("snowflake.snowpark.context").get_active_session()
+    except Exception:
+        return None
+
+def resolve_db_path(db_path):
+    # Relative paths are taken from the project root, like LOCAL_DB_PATH, not the working directory
+    return os.path.join(PROJECT_ROOT, os.path.expanduser(db_path))
+
+
+def get_local_connection(db_path=None):
+    # Read-only: a mistyped path must fail here instead of creating an empty database
+    path = resolve_db_path(db_path or LOCAL_DB_PATH)
+    try:
+        return sqlite3.connect(f"{pathlib.Path(path).as_uri()}?mode=ro", uri=True)
+    except sqlite3.OperationalError:
+        raise FileNotFoundError(f"SQLite database not found: {path}") from None
+
+
+def query_control_table(session, name, schema=CONTROL_SCHEMA, db_path=None, from_run_id=None):
+    # Raises on failure; callers decide whether an empty frame is an acceptable fallback.
+    # Identical concurrent uncached queries (parallel live polls, environment loads) share one backend load.
+    key = (name, schema, db_path, None if from_run_id is None else int(from_run_id))
+    return single_flight(key, lambda: _run_control_query(session, name, schema, db_path, from_run_id))
+
+
+def _run_control_query(session, name, schema, db_path, from_run_id):
+    table, columns = CONTROL_TABLES[name]
+
+    # 1. Snowflake (unless the environment points at a local SQLite file)
+    if session and not db_path:
+        where = f"WHERE RUN_ID >= {int(from_run_id)}" if from_run_id is not None else ""
+        return session.sql(f"""
+            SELECT {", ".join(columns)}
+            FROM {schema}.{table}
+            {where}
+        """).to_pandas()
 
+    # 2. Local SQLite (Simulation Mode)
+    if SIMULATION_LATENCY_MS:
+        time.sleep(SIMULATION_LATENCY_MS / 1000)
+    conn = get_local_connection(db_path)
+    try:
+        if from_run_id is None:
+            return pd.read_sql(f"SELECT * FROM {table}", conn)
+        return pd.read_sql(f"SELECT * FROM {table} WHERE RUN_ID >= ?", conn, params=(int(from_run_id),))
+    finally:
+        conn.close()
+
+
+def _load_or_empty(session, name, schema=CONTROL_SCHEMA, db_path=None, from_run_id=None):
+    try:
+        return query_control_table(session, name, schema, db_path, from_run_id)
     except Exception as e:
         # Fallback for schema validation if DB missing
         print(f"Loader Error: {e}")
-        return pd.DataFrame(columns=[
-            "PIPELINE_NAME", "RUN_ID", "JOB_NAME", "JOB_START_TIME", 
-            "END_TIME", "EXECUTION_STATUS", "PIPELINE_START_TIME"
-        ])
+        return pd.DataFrame(columns=CONTROL_TABLES[name][1])
 
 
 @st.cache_data(ttl=600)
-def load_sources(_session):
-    try:
-        if _session:
-            return _session.sql("""
-                SELECT
-                    RUN_ID,
-                    PIPELINE_NAME,
-                    SOURCE_TABLE,
-                    PIPELINE_START_TIME,
-                    ROW_COUNT,
-                    BYTES
-                FROM DB_RETAIL_PRD.CONTROL.DIM_PIPELINE_CONTROL_SOURCE
-            """).to_pandas()
-        else:
-            conn = get_local_connection()
-            df = pd.read_sql("SELECT * FROM DIM_PIPELINE_CONTROL_SOURCE", conn)
-            conn.close()
-            return df
-            
-    except Exception:
-        return pd.DataFrame(columns=[
-            "RUN_ID", "PIPELINE_NAME", "SOURCE_TABLE", 
-            "PIPELINE_START_TIME", "ROW_COUNT", "BYTES"
-        ])
+def load_job_timeliness(_session, schema=CONTROL_SCHEMA, db_path=None):
+    return _load_or_empty(_session, "jobs", schema, db_path)
 
 
 @st.cache_data(ttl=600)
-def load_outputs(_session):
-    try:
-        if _session:
-            return _session.sql("""
-                SELECT
-                    RUN_ID,
-                    PIPELINE_NAME,
-                    SINK_TABLE,
-                    ROW_COUNT
-                FROM DB_RETAIL_PRD.CONTROL.DIM_PIPELINE_CONTROL_OUTPUT_COMPLETENESS
-            """).to_pandas()
-        else:
-            conn = get_local_connection()
-            df = pd.read_sql("SELECT * FROM DIM_PIPELINE_CONTROL_OUTPUT_COMPLETENESS", conn)
-            conn.close()
-            return df
-            
-    except Exception:
-        return pd.DataFrame(columns=[
-            "RUN_ID", "PIPELINE_NAME", "SINK_TABLE", "ROW_COUNT"
-        ])
+def load_sources(_session, schema=CONTROL_SCHEMA, db_path=None):
+    return _load_or_empty(_session, "sources", schema, db_path)
 
 
 @st.cache_data(ttl=600)
-def load_uniqueness(_session):
-    try:
-        if _session:
-            return _session.sql("""
-                SELECT
-                    RUN_ID,
-                    PIPELINE_NAME,
-                    PIPELINE_START_TIME,
-                    SINK_TABLE,
-                    DUPLICATE_COUNT,
-                    DUPLICATE_PERCENTAGE,
-                    DUPLICATE_THRESHOLD
-                FROM DB_RETAIL_PRD.CONTROL.DIM_PIPELINE_CONTROL_UNIQUENESS
-            """).to_pandas()
-        else:
-            conn = get_local_connection()
-            df = pd.read_sql("SELECT * FROM DIM_PIPELINE_CONTROL_UNIQUENESS", conn)
-            conn.close()
-            return df
+def load_outputs(_session, schema=CONTROL_SCHEMA, db_path=None):
+    return _load_or_empty(_session, "outputs", schema, db_path)
 
-    except Exception:
-        return pd.DataFrame(columns=[
-            "RUN_ID", "PIPELINE_NAME", "PIPELINE_START_TIME", "SINK_TABLE", 
-            "DUPLICATE_COUNT", "DUPLICATE_PERCENTAGE", "DUPLICATE_THRESHOLD"
-        ])
+
+@st.cache_data(ttl=600)
+def load_uniqueness(_session, schema=CONTROL_SCHEMA, db_path=None):
+    return _load_or_empty(_session, "uniqueness", schema, db_path)
 
 
 @st.cache_data(ttl=600)
-def load_integrity(_session):
-    try:
-        if _session:
-            return _session.sql("""
-                SELECT
-                    RUN_ID,
-                    PIPELINE_NAME,
-                    PIPELINE_START_TIME,
-                    NULL_COUNT
-                FROM DB_RETAIL_PRD.CONTROL.DIM_PIPELINE_CONTROL_INTEGRITY
-            """).to_pandas()
+def load_integrity(_session, schema=CONTROL_SCHEMA, db_path=None):
+    return _load_or_empty(_session, "integrity", schema, db_path)
+
+
+FRAME_LOADERS = {
+    "jobs": load_job_timeliness,
+    "sources": load_sources,
+    "outputs": load_outputs,
+    "uniqueness": load_uniqueness,
+    "integrity": load_integrity,
+}
+
+
+def load_frame(session, name, schema=CONTROL_SCHEMA, db_path=None):
+    return FRAME_LOADERS[name](session, schema, db_path)
+
+
+def load_all_frames(session, schema=CONTROL_SCHEMA, db_path=None):
+    return {name: load_frame(session, name, schema, db_path) for name in FRAME_LOADERS}
+
+
+def query_all_frames(session, schema=CONTROL_SCHEMA, db_path=None):
+    # Uncached and raising: the headless export must fail loudly rather than publish an empty report
+    return {name: query_control_table(session, name, schema, db_path) for name in CONTROL_TABLES}
+
+
+def load_new_runs(session, name, last_run_id, schema=CONTROL_SCHEMA, db_path=None):
+    # Not cached: live mode polls from its watermark run onwards (inclusive, so rows written
+    # late for that run are returned too) and drops the rows it has already counted
+    return _load_or_empty(session, name, schema, db_path, from_run_id=last_run_id)
+
+
+# --- Multi-Environment Federation ---
+# PIPELINE_HEALTH_ENVIRONMENTS holds a JSON list such as
+#   [{"name": "PRD", "schema": "DB_RETAIL_PRD.CONTROL"}, {"name": "UAT", "db_path": "uat_simulation.db"}]
+# Entries with a db_path are read from that SQLite file instead of Snowflake.
+ENVIRONMENTS_VAR = "PIPELINE_HEALTH_ENVIRONMENTS"
+
+
+def get_environments(session):
+    # Raises ValueError with a readable message when the configuration is unusable
+    raw = os.environ.get(ENVIRONMENTS_VAR)
+    if raw:
+        try:
+            environments = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"{ENVIRONMENTS_VAR} is not valid JSON: {e}")
+    elif session:
+        environments = [{"name": "PRD", "schema": CONTROL_SCHEMA}]
+    else:
+        environments = [{"name": "LOCAL", "db_path": LOCAL_DB_PATH}]
+
+    if not isinstance(environments, list) or not environments:
+        raise ValueError(f"{ENVIRONMENTS_VAR} must be a non-empty JSON list of environments.")
+    for i, env in enumerate(environments):
+        if not isinstance(env, dict) or not env.get("name"):
+            raise ValueError(f"{ENVIRONMENTS_VAR} entry {i} must be an object with a \"name\".")
+    names = [env["name"] for env in environments]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{ENVIRONMENTS_VAR} contains duplicate environment names.")
+
+    return [
+        {
+            "name": env["name"],
+            "schema": env.get("schema", CONTROL_SCHEMA),
+            "db_path": resolve_db_path(env["db_path"]) if env.get("db_path") else None,
+        }
+        for env in environments
+    ]
+
+
+@st.cache_data(ttl=600)
+def load_environment_frame(_session, name, environment, schema=CONTROL_SCHEMA, db_path=None):
+    # Raises instead of returning an empty frame so a broken environment is reported, and not cached
+    return query_control_table(_session, name, schema, db_path).assign(ENVIRONMENT=environment)
+
+
+def _load_environment(session, environment, names):
+    if not environment["db_path"] and not session:
+        # Never fall back to the local simulation DB for a Snowflake environment: it would be mislabelled
+        raise RuntimeError(f"No Snowflake session available to query {environment['schema']}")
+    started = time.perf_counter()
+    frames = {
+        name: load_environment_frame(session, name, environment["name"], environment["schema"], environment["db_path"])
+        for name in names
+    }
+    return frames, elapsed_ms(started)
+
+
+# One pool shared by all sessions and reruns. A load that is still running is awaited
+# again instead of being resubmitted, so a hanging environment ties up one thread at most.
+ENVIRONMENT_WORKERS = 8
+_environment_pool = ThreadPoolExecutor(max_workers=ENVIRONMENT_WORKERS, thread_name_prefix="environment-loader")
+_environment_loads = {}
+_environment_loads_lock = threading.Lock()
+
+
+def _load_environment_with_ctx(ctx, session, environment, names):
+    add_script_run_ctx(threading.current_thread(), ctx)
+    return _load_environment(session, environment, names)
+
+
+def _submit_environment_load(session, environment, names, ctx):
+    key = (environment["name"], environment["schema"], environment["db_path"], tuple(names))
+    with _environment_loads_lock:
+        future = _environment_loads.get(key)
+        if future is None or future.done():
+            future = _environment_pool.submit(_load_environment_with_ctx, ctx, session, environment, names)
+            _environment_loads[key] = future
+    return future
+
+
+def load_environments(session, environments, names=tuple(CONTROL_TABLES), timeout=30):
+    # A slow or failing environment only affects its own entry
+    ctx = get_script_run_ctx()
+    futures = {_submit_environment_load(session, env, names, ctx): env["name"] for env in environments}
+    done, _ = wait(futures, timeout=timeout)
+
+    results, status = {}, {}
+    for future, env_name in futures.items():
+        if future not in done:
+            status[env_name] = {"state": "timeout", "detail": f"No response within {timeout}s"}
+        elif future.exception() is not None:
+            status[env_name] = {"state": "error", "detail": str(future.exception())}
         else:
-            conn = get_local_connection()
-            df = pd.read_sql("SELECT * FROM DIM_PIPELINE_CONTROL_INTEGRITY", conn)
-            conn.close()
-            return df
+            results[env_name], ms = future.result()
+            status[env_name] = {"state": "ok", "detail": f"{ms:.0f} ms"}
 
-    except Exception:
-        return pd.DataFrame(columns=[
-            "RUN_ID", "PIPELINE_NAME", "PIPELINE_START_TIME", "NULL_COUNT"
-        ])
+    # Stragglers keep running and warm their cache entry; the next rerun waits on the same load
+    return results, status
@@ -0,0 +1,118 @@
+import html
+import json
+import os
+from datetime import datetime, timezone
+
+from components.charts import duration_trend_chart, sla_breach_chart, volume_trend_chart
+
+# Same column selections the dashboard sections render
+REPORT_TABLES = {
+    "jobs": ["PIPELINE_NAME", "RUN_ID", "JOB_NAME", "EXECUTION_STATUS", "JOB_START_TIME", "END_TIME", "DURATION_MINUTES", "SLA_BREACH"],
+    "sources": ["PIPELINE_NAME", "RUN_ID", "SOURCE_TABLE", "PIPELINE_START_TIME", "ROW_COUNT", "BYTES"],
+    "outputs": ["PIPELINE_NAME", "RUN_ID", "SINK_TABLE", "ROW_COUNT"],
+    "uniqueness": ["PIPELINE_NAME", "RUN_ID", "SINK_TABLE", "DUPLICATE_COUNT", "DUPLICATE_PERCENTAGE", "DUPLICATE_THRESHOLD"],
+    "integrity": ["PIPELINE_NAME", "RUN_ID", "PIPELINE_START_TIME", "NULL_COUNT"],
+}
+
+
+def report_charts(frames, theme="light"):
+    return {
+        "Job Duration Trend": duration_trend_chart(frames["jobs"], theme),
+        "SLA Breach Count": sla_breach_chart(frames["jobs"], theme),
+        "Daily Row Count Processed": volume_trend_chart(frames["sources"], theme),
+    }
+
+
+def _report_table(df, name):
+    return df[[c for c in REPORT_TABLES[name] if c in df.columns]]
+
+
+def write_tables(frames, output_dir):
+    tables_dir = os.path.join(output_dir, "tables")
+    os.makedirs(tables_dir, exist_ok=True)
+    written = []
+    for name in REPORT_TABLES:
+        df = _report_table(frames[name], name)
+        try:
+            path = os.path.join(tables_dir, f"{name}.parquet")
+            df.to_parquet(path, index=False)
+        except ImportError:
+            # pyarrow/fastparquet are optional; CSV keeps the bundle usable without them
+            path = os.path.join(tables_dir, f"{name}.csv")
+            df.to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def write_kpis(kpis, output_dir, generated_at):
+    path = os.path.join(output_dir, "kpis.json")
+    with open(path, "w") as f:
+        json.dump({"generated_at": generated_at, "kpis": kpis}, f, indent=2)
+    return path
+
+
+def render_html(frames, kpis, charts, generated_at):
+    cards = []
+    for section, values in kpis.items():
+        for key, value in values.items():
+            shown = f"{value:,.2f}" if isinstance(value, float) else f"{value:,}"
+            cards.append(
+                f'<div class="card"><div class="label">{html.escape(section)} · {html.escape(key)}</div>'
+                f'<div class="value">{shown}</div></div>'
+            )
+
+    chart_html = []
+    for i, (title, fig) in enumerate(charts.items()):
+        # Only the first chart ships the plotly.js loader
+        chart_html.append(fig.to_html(full_html=False, include_plotlyjs="cdn" if i == 0 else False))
+
+    table_html = []
+    for name in REPORT_TABLES:
+        df = _report_table(frames[name], name)
+        table_html.append(f"<h2>{html.escape(name.title())}</h2>")
+        table_html.append(df.to_html(index=False, border=0, classes="table") if not df.empty else "<p>No data available.</p>")
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Pipeline Health Report</title>
+<style>
+body {{ font-family: Inter, sans-serif; background: #f4f9ff; color: #1e293b; margin: 2rem; }}
+h1, h2 {{ color: #0d3b66; }}
+.cards {{ display: flex; flex-wrap: wrap; gap: 12px; }}
+.card {{ background: #ffffff; border: 1px solid #d0e3ff; border-radius: 15px; padding: 15px; min-width: 180px; }}
+.label {{ font-size: 0.8rem; color: #64748b; }}
+.value {{ font-size: 1.6rem; font-weight: 600; color: #0d3b66; }}
+.table {{ border-collapse: collapse; font-size: 0.85rem; }}
+.table th {{ background: #e6f2ff; color: #0d3b66; padding: 4px 8px; }}
+.table td {{ border-bottom: 1px solid #e6f2ff; padding: 4px 8px; }}
+</style>
+</head>
+<body>
+<h1>Pipeline Health Report</h1>
+<p>Generated {html.escape(generated_at)}</p>
+<div class="cards">{''.join(cards)}</div>
+{''.join(chart_html)}
+{''.join(table_html)}
+</body>
+</html>
+"""
+
+
+def export_report(frames, kpis, output_dir, theme="light", formats=("html", "json", "parquet")):
+    os.makedirs(output_dir, exist_ok=True)
+    generated_at = datetime.now(timezone.utc).isoformat()
+    written = []
+
+    if "json" in formats:
+        written.append(write_kpis(kpis, output_dir, generated_at))
+    if "parquet" in formats:
+        written.extend(write_tables(frames, output_dir))
+    if "html" in formats:
+        path = os.path.join(output_dir, "report.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_html(frames, kpis, report_charts(frames, theme), generated_at))
+        written.append(path)
+
+    return written
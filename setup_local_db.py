@@ -1,10 +1,14 @@
 
+import os
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 import random
 
-# Connect/Create DB
-conn = sqlite3.connect("local_simulation.db")
+# Connect/Create DB (optional path argument creates extra environments, e.g. uat_simulation.db)
+# Relative paths are created in the project root, where the dashboard resolves them
+db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), sys.argv[1] if len(sys.argv) > 1 else "local_simulation.db")
+conn = sqlite3.connect(db_path)
 cursor = conn.cursor()
 
 # Pipelines and configuration
@@ -106,20 +110,33 @@ for i in range(50):
     is_fail = random.random() < 0.15 # 15% fail rate
     status = "FAILED" if is_fail else "SUCCESS"
     
-    # SLA Breach Logic
-    duration_mins = random.randint(20, 90) if not is_fail else random.randint(5, 120)
-    job_end = job_start + timedelta(minutes=duration_mins)
-    
-    job_name = f"LOAD_{pipeline.split('_')[1]}"
-    
-    # 1. Insert Timeliness
-    cursor.execute("""
-    INSERT INTO DIM_PIPELINE_JOB_TIMELINESS VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        pipeline, run_id, job_name, 
-        job_start.isoformat(), job_end.isoformat(), 
-        status, pipeline_start.isoformat()
-    ))
+    # 1. Insert Timeliness (1-3 jobs per run; the final LOAD job carries the run status)
+    stages = ["EXTRACT", "TRANSFORM", "LOAD"][-random.randint(1, 3):]
+    for stage in stages:
+        is_last = stage == "LOAD"
+        
+        # SLA Breach Logic
+        if is_last:
+            duration_mins = random.randint(20, 90) if not is_fail else random.randint(5, 120)
+        else:
+            duration_mins = random.randint(5, 30)
+        job_end = job_start + timedelta(minutes=duration_mins)
+        
+        job_name = f"{stage}_{pipeline.split('_')[1]}"
+        
+        cursor.execute("""
+        INSERT INTO DIM_PIPELINE_JOB_TIMELINESS VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            pipeline, run_id, job_name, 
+            job_start.isoformat(), job_end.isoformat(), 
+            status if is_last else "SUCCESS", pipeline_start.isoformat()
+        ))
+        
+        # Next job: usually after an idle gap, sometimes overlapping the previous one
+        if random.random() < 0.2:
+            job_start = job_end - timedelta(minutes=random.randint(1, duration_mins))
+        else:
+            job_start = job_end + timedelta(minutes=random.randint(0, 15))
     
     # 2. Insert Source
     src_table, sink_table = tables_map[pipeline]
@@ -160,4 +177,4 @@ for i in range(50):
 
 conn.commit()
 conn.close()
-print("Local SQLite Simulation DB Created Successfully with 5 Tables.")
+print(f"Local SQLite Simulation DB ({db_path}) Created Successfully with 5 Tables.")
@@ -1,23 +1,35 @@
+import time
+_script_started = time.perf_counter()
 
 import streamlit as st
-try:
-    from snowflake.snowpark.context import get_active_session
-except ImportError:
-    # Fallback for local testing if snowflake-snowpark-python is not fully configured or used outside Snowflake
-    def get_active_session():
-        # This is a placeholder. In a real scenario, you would create a session manually if needed.
-        # Returning None to handle potential errors gracefully
-        return None
-
+import numpy as np
+import pandas as pd
 import sys
 import os
 
 # Ensure we can import modules if running from root or nested
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.data_loader import *
-from processing.transformations import *
-from components.charts import *
+# Explicit imports only; plotly.express and snowpark are imported lazily on first use
+from services.data_loader import (
+    FRAME_LOADERS, get_environments, get_session, load_environments, load_frame, load_new_runs
+)
+from processing.transformations import prepare_frame
+from processing.kpis import execution_kpis, volume_kpis
+from processing.live import apply_new_runs, init_live_state
+from processing.run_index import build_run_index, lookup_run
+from processing.environments import environment_health
+from processing.timeline import compute_job_timeline, compute_run_timelines, critical_path_attribution
+from processing.quality import (
+    breach_count, breaches_by_pipeline, build_quality_rollups, duplicate_trends, null_trends
+)
+from components.charts import (
+    apply_theme_to_fig, critical_path_chart, duplicate_trend_chart, duration_trend_chart, environment_health_chart,
+    extend_duration_traces, null_rate_trend_chart, replace_duration_points, volume_trend_chart
+)
+from utils.timing import IMPORT_TIMINGS_MS, elapsed_ms
+
+IMPORTS_MS = elapsed_ms(_script_started)
 
 st.set_page_config(
     page_title="Pipeline Operations Dashboard",
@@ -30,149 +42,20 @@ if "theme_mode" not in st.session_state:
     st.session_state.theme_mode = "dark"
 
 # ---- THEME LOGIC ----
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+
+@st.cache_resource
+def load_theme_css(theme):
+    # Read from disk once per worker; each rerun only re-sends the cached <style> block
+    with open(os.path.join(ASSETS_DIR, f"theme_{theme}.css")) as f:
+        return f"<style>\n{f.read()}</style>"
+
+
 def apply_theme(theme):
-    if theme == "dark":
-        st.markdown("""
-        <style>
-
-        /* ===== FULL APP BACKGROUND FIX ===== */
-        .stApp {
-            background: linear-gradient(135deg, #0b1220, #0f1b33) !important;
-            color: #ffffff !important;
-        }
-
-        section[data-testid="stSidebar"] {
-            background-color: #0b1220 !important;
-        }
-
-        /* ===== HEADINGS ===== */
-        h1, h2, h3, h4, h5, h6 {
-            color: #ffffff !important;
-            text-shadow: 0 0 10px rgba(255,255,255,0.4);
-        }
-
-        p, span, label {
-            color: #e2e8f0 !important;
-        }
-
-        /* ===== TOGGLE BUTTON (VISIBLE IN DARK) ===== */
-        div.stButton > button {
-            background-color: #1e293b !important;
-            color: #ffffff !important;
-            border: 1px solid #3b82f6 !important;
-            box-shadow: 0 0 12px rgba(59,130,246,0.6);
-            border-radius: 10px !important;
-        }
-
-        /* ===== METRIC CARDS ===== */
-        div[data-testid="stMetric"] {
-            background: linear-gradient(145deg, #111c33, #0b1220);
-            border: 1px solid #1e3a8a;
-            border-radius: 15px;
-            box-shadow: 0 0 25px rgba(0,123,255,0.4);
-            padding: 15px;
-        }
-
-        /* ===== AG GRID TABLE DARK FIX ===== */
-        .ag-root-wrapper {
-            background-color: #0f172a !important;
-            border-radius: 12px !important;
-            border: 1px solid #1e3a8a !important;
-            box-shadow: 0 0 25px rgba(0,123,255,0.4);
-        }
-
-        .ag-header {
-            background-color: #111c33 !important;
-        }
-
-        .ag-header-cell-label {
-            color: #60a5fa !important;
-            font-weight: 600;
-        }
-
-        .ag-cell {
-            background-color: #0f172a !important;
-            color: #ffffff !important;
-            border-bottom: 1px solid #1e293b !important;
-        }
-
-        .ag-row-odd, .ag-row-even {
-            background-color: #0f172a !important;
-        }
-
-        .ag-row:hover {
-            background-color: #1e3a8a !important;
-        }
-
-        </style>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown("""
-        <style>
-        /* ===== GLOBAL LIGHT ===== */
-        html, body, [class*="css"]  {
-            background-color: #f4f9ff !important;
-            color: #000000 !important;
-        }
-
-        h1, h2, h3, h4, h5, h6, .section-title {
-            color: #0d3b66 !important;
-        }
-        
-        p, span, label, li, .section-subtitle {
-             color: #1e293b !important;
-        }
-
-        /* ===== TOGGLE BUTTON FIX ===== */
-        div.stButton > button {
-            background: #0d3b66 !important;
-            color: white !important;
-            border-radius: 10px !important;
-            font-weight: 600;
-        }
-
-        /* ===== METRIC CARDS GLASS EFFECT ===== */
-        div[data-testid="stMetric"], div[data-testid="metric-container"] {
-            background: rgba(255,255,255,0.6);
-            backdrop-filter: blur(12px);
-            border-radius: 15px;
-            border: 1px solid rgba(0,123,255,0.3);
-            box-shadow: 0 8px 32px rgba(0,123,255,0.2);
-            padding: 15px;
-        }
-        
-        div[data-testid="stMetricValue"] {
-             color: #0d3b66 !important;
-        }
-
-        /* ===== TABLE LIGHT MODE ===== */
-        .ag-root-wrapper {
-            background-color: #ffffff !important;
-            border-radius: 12px;
-            border: 1px solid #d0e3ff !important;
-            box-shadow: 0 0 20px rgba(0,123,255,0.2);
-        }
-
-        .ag-header {
-            background-color: #e6f2ff !important;
-        }
-
-        .ag-header-cell-label {
-            color: #0d3b66 !important;
-            font-weight: 600;
-        }
-
-        .ag-cell {
-            background-color: #ffffff !important;
-            color: #000000 !important;
-            border-bottom: 1px solid #e6f2ff !important;
-        }
-
-        .ag-row:hover {
-            background-color: #d6eaff !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+    # Streamlit drops elements that are not re-emitted on a full rerun, so the style
+    # block must be sent every time; fragment reruns skip it entirely.
+    st.markdown(load_theme_css("dark" if theme == "dark" else "light"), unsafe_allow_html=True)
 
 # ---- HEADER & TOGGLE ----
 col1, col2 = st.columns([10,1])
@@ -220,43 +103,69 @@ def style_table(df, theme):
 
 
 
-session = None
-try:
-    session = get_active_session()
-except Exception:
-    session = None
+session = get_session()
 
-# --- Load Data (With Fallback for View Mode) ---
-from datetime import datetime, timedelta
-import pandas as pd
+if session is None:
+    st.info("ℹ️ Running in Local Simulation Mode (SQLite). Logic validated against production schema.")
 
-# --- Load Data (Production or Simulation) ---
-try:
-    df_jobs = load_job_timeliness(session)
-    df_sources = load_sources(session)
-    df_outputs = load_outputs(session)
-    df_uniqueness = load_uniqueness(session)
-    df_integrity = load_integrity(session)
 
-except Exception as e:
-    st.error(f"Critical Error loading data: {e}")
-    st.stop()
+# --- Section Data (loaded and transformed only when a section is opened) ---
+@st.cache_data(ttl=600)
+def get_section_frame(_session, name):
+    return prepare_frame(name, load_frame(_session, name))
+
+
+@st.cache_resource(ttl=600)
+def get_run_index(_session):
+    # Built once per cache window and shared by every drill-down selection
+    return build_run_index({name: get_section_frame(_session, name) for name in FRAME_LOADERS})
+
+
+@st.cache_data(ttl=600)
+def get_quality_rollups(_session):
+    return build_quality_rollups({
+        name: get_section_frame(_session, name) for name in ("uniqueness", "integrity", "outputs")
+    })
+
+
+@st.cache_data(ttl=600)
+def get_run_timelines(_session):
+    job_timeline = compute_job_timeline(get_section_frame(_session, "jobs"))
+    return compute_run_timelines(job_timeline), critical_path_attribution(job_timeline)
+
+
+def current_quality_rollups(session):
+    # Live mode folds new runs into its own copy of the rollups; prefer it when active
+    live_state = st.session_state.get("live_state")
+    if live_state is not None:
+        return live_state["quality"]
+    return get_quality_rollups(session)
 
-if session is None:
-    st.info("ℹ️ Running in Local Simulation Mode (SQLite). Logic validated against production schema.")
 
-# --- Transformations ---
-# Jobs
-df_jobs = standardize_datetimes(df_jobs, ["PIPELINE_START_TIME", "JOB_START_TIME", "END_TIME"])
-df_jobs = calculate_duration_minutes(df_jobs)
-df_jobs = detect_sla_breach(df_jobs)
-df_jobs = add_week_period(df_jobs, "PIPELINE_START_TIME")
-df_jobs = map_execution_status(df_jobs)
+def highlight_rows(df, mask):
+    # Vectorised row highlight: one style frame instead of a Python call per row
+    styles = np.where(mask.to_numpy()[:, None], "background-color: rgba(239, 68, 68, 0.2)", "")
+    return pd.DataFrame(np.broadcast_to(styles, df.shape), index=df.index, columns=df.columns)
 
-# Other Data Frames (Standardize if needed for future features)
-df_sources = standardize_datetimes(df_sources, ["PIPELINE_START_TIME"])
-df_uniqueness = standardize_datetimes(df_uniqueness, ["PIPELINE_START_TIME"])
-df_integrity = standardize_datetimes(df_integrity, ["PIPELINE_START_TIME"])
+
+def section_header(title, subtitle):
+    st.markdown(f"""
+    <div class="section-title">{title}</div>
+    <div class="section-subtitle">{subtitle}</div>
+    """, unsafe_allow_html=True)
+
+
+def section_is_open(key, default=False):
+    # The toggle lives inside the section fragment, so opening/closing it reruns only that section
+    return st.toggle("Show section", value=default, key=f"show_{key}")
+
+
+def load_section_frame(session, name):
+    try:
+        return get_section_frame(session, name)
+    except Exception as e:
+        st.error(f"Error loading {name} data: {e}")
+        return None
 
 
 # --- UI HEADER ---
@@ -267,152 +176,445 @@ st.markdown("""
 st.markdown("---")
 
 
-# --- HELPER COMPONENT ---
-# --- 1️⃣ EXECUTION TIMELINESS ---
-st.markdown("""
-<div class="section-title">1️⃣ Execution Timeliness</div>
-<div class="section-subtitle">Audit of job duration, execution status, and SLA adherence based on DIM_PIPELINE_JOB_TIMELINESS.</div>
-""", unsafe_allow_html=True)
+# --- 🔴 LIVE MONITOR ---
+LIVE_INTERVALS = [10, 30, 60, 120, 300]
+
+
+def live_metric(label, section, key, fmt="{:,}"):
+    value = st.session_state.live_state["kpis"].get(section, {}).get(key, 0)
+    delta = st.session_state.live_state["last_delta"].get(section, {}).get(key)
+    return label, fmt.format(value), (fmt.format(delta) if delta else None)
+
+
+def poll_live_state(session, theme_choice):
+    state = st.session_state.get("live_state")
+    if state is None:
+        frames = {name: get_section_frame(session, name) for name in FRAME_LOADERS}
+        state = init_live_state(frames)
+        state["figure"] = duration_trend_chart(frames["jobs"], theme_choice)
+        state["theme"] = theme_choice
+        st.session_state.live_state = state
+        return set()
+
+    polled = {
+        name: prepare_frame(name, load_new_runs(session, name, state["last_run_id"][name]))
+        for name in FRAME_LOADERS
+    }
+    changed, new_frames, revised = apply_new_runs(state, polled)
+
+    if state["theme"] != theme_choice:
+        state["figure"] = apply_theme_to_fig(state["figure"], theme_choice)
+        state["theme"] = theme_choice
+    if "jobs" in revised:
+        replace_duration_points(state["figure"], *revised["jobs"])
+    extend_duration_traces(state["figure"], new_frames.get("jobs", state["templates"]["jobs"]))
+    return changed
+
+
+def render_live_panel(session, theme_choice):
+    changed = poll_live_state(session, theme_choice)
+    state = st.session_state.live_state
+
+    cols = st.columns(5)
+    for col, args in zip(cols, [
+        ("Distinct Pipelines", "execution", "distinct_pipelines"),
+        ("Total Job Runs", "execution", "total_runs"),
+        ("Failed Runs", "execution", "fail_runs"),
+        ("SLA Breaches", "execution", "sla_breaches"),
+        ("Total Null Records", "integrity", "total_nulls"),
+    ]):
+        col.metric(*live_metric(*args))
+
+    watermark = state["last_run_id"]["jobs"]
+    if changed:
+        st.caption(f"Poll #{state['polls']}: new runs for {', '.join(sorted(changed))} • last RUN_ID {watermark}")
+    else:
+        st.caption(f"Poll #{state['polls']}: no new runs • last RUN_ID {watermark}")
+
+    st.plotly_chart(state["figure"], use_container_width=True, key="live_duration_chart")
+
+
+@st.fragment
+def render_live_monitor(session, theme_choice):
+    section_header(
+        "🔴 Live Monitor",
+        "Polls the control tables for runs newer than the last seen RUN_ID and updates KPIs incrementally."
+    )
+    c1, c2 = st.columns([1, 3])
+    live_on = c1.toggle("Live mode", key="live_mode")
+    interval = c2.select_slider(
+        "Refresh interval (seconds)", options=LIVE_INTERVALS, value=30, key="live_interval"
+    )
+    if not live_on:
+        st.session_state.pop("live_state", None)
+        return
+
+    # Only the live panel reruns on the timer; the rest of the page is untouched
+    st.fragment(run_every=interval)(render_live_panel)(session, theme_choice)
+
+
+# --- 🔎 RUN DRILL-DOWN ---
+@st.fragment
+def render_run_drilldown(session, theme_choice):
+    section_header(
+        "🔎 Run Drill-Down",
+        "Jobs, source volume, output rows, duplicates and nulls of a single run across all control tables."
+    )
+    if not section_is_open("drilldown"):
+        return
 
-if not df_jobs.empty:
-    # Strict Metrics: Raw Counts
-    total_runs = len(df_jobs)
-    distinct_pipelines = df_jobs["PIPELINE_NAME"].nunique()
-    # Using raw status counts
-    success_runs = len(df_jobs[df_jobs["STATUS"] == "PASS"])
-    fail_runs = len(df_jobs[df_jobs["STATUS"] == "FAIL"])
-    sla_breaches = df_jobs["SLA_BREACH"].sum()
+    run_index = get_run_index(session)
+    runs_by_pipeline = run_index["runs_by_pipeline"]
+    if not runs_by_pipeline:
+        st.info("No runs available.")
+        return
+
+    c1, c2 = st.columns(2)
+    pipeline = c1.selectbox("Pipeline", sorted(runs_by_pipeline), key="drill_pipeline")
+    run_id = c2.selectbox("Run ID", runs_by_pipeline[pipeline], key="drill_run_id")
+
+    detail = lookup_run(run_index, pipeline, run_id)
+    df_jobs = detail["jobs"]
+    df_uniqueness = detail["uniqueness"]
 
     m1, m2, m3, m4, m5 = st.columns(5)
-    m1.metric("Distinct Pipelines", distinct_pipelines)
-    m2.metric("Total Job Runs", total_runs)
-    m3.metric("Success Runs", success_runs)
-    m4.metric("Failed Runs", fail_runs)
-    m5.metric("SLA Breaches", int(sla_breaches))
-
-    tab_t1, tab_t2 = st.tabs(["📉 Duration Trend", "📋 Raw Execution Log"])
-    
-    with tab_t1:
-        st.plotly_chart(duration_trend_chart(df_jobs, theme_choice), use_container_width=True)
-        
-    with tab_t2:
-        # Displaying raw fields + computed duration for audit
+    m1.metric("Failed Jobs", int((df_jobs["STATUS"] == "FAIL").sum()) if not df_jobs.empty else 0)
+    m2.metric("Source Rows", f"{detail['sources']['ROW_COUNT'].sum():,.0f}")
+    m3.metric("Output Rows", f"{detail['outputs']['ROW_COUNT'].sum():,.0f}")
+    m4.metric("Duplicates", f"{df_uniqueness['DUPLICATE_COUNT'].sum():,.0f}")
+    m5.metric("Null Records", f"{detail['integrity']['NULL_COUNT'].sum():,.0f}")
+
+    if not df_jobs.empty:
+        st.markdown("### Jobs")
         st.dataframe(
             style_table(
-                df_jobs[[
-                    "PIPELINE_NAME", "JOB_NAME", "EXECUTION_STATUS", "JOB_START_TIME", "END_TIME", "DURATION_MINUTES", "SLA_BREACH"
-                ]], 
+                df_jobs[["JOB_NAME", "EXECUTION_STATUS", "JOB_START_TIME", "END_TIME", "DURATION_MINUTES", "SLA_BREACH"]],
                 theme_choice
-            ).map(
-                lambda v: "color: #ef4444; font-weight:bold;" if v == True else ""
-                , subset=["SLA_BREACH"]
             ),
             use_container_width=True
         )
-else:
-    st.info("No execution data available.")
+    else:
+        st.info("No job records for this run.")
 
-st.markdown("---")
+    col_d1, col_d2 = st.columns(2)
+    with col_d1:
+        st.markdown("### Sources & Outputs")
+        st.dataframe(
+            style_table(detail["sources"][["SOURCE_TABLE", "ROW_COUNT", "BYTES"]], theme_choice),
+            use_container_width=True
+        )
+        st.dataframe(
+            style_table(detail["outputs"][["SINK_TABLE", "ROW_COUNT"]], theme_choice),
+            use_container_width=True
+        )
+    with col_d2:
+        st.markdown("### Data Quality")
+        st.dataframe(
+            style_table(
+                df_uniqueness[["SINK_TABLE", "DUPLICATE_COUNT", "DUPLICATE_PERCENTAGE", "DUPLICATE_THRESHOLD"]],
+                theme_choice
+            ),
+            use_container_width=True
+        )
+        st.dataframe(
+            style_table(detail["integrity"][["NULL_COUNT"]], theme_choice),
+            use_container_width=True
+        )
 
-# --- 2️⃣ DATA VOLUME & THROUGHPUT ---
-st.markdown("""
-<div class="section-title">2️⃣ Data Volume & Throughput</div>
-<div class="section-subtitle">Tracking row counts and data size processed by pipelines.</div>
-""", unsafe_allow_html=True)
 
-if not df_sources.empty:
-    total_rows = df_sources["ROW_COUNT"].sum()
-    total_gb = df_sources["BYTES"].sum() / (1024**3)
-    
-    col1, col2 = st.columns(2)
-    col1.metric("Total Rows Processed", f"{total_rows:,.0f}")
-    col2.metric("Total Data Volume", f"{total_gb:.2f} GB")
-    
-    col_v1, col_v2 = st.columns([2, 1])
-    with col_v1:
-        st.plotly_chart(volume_trend_chart(df_sources, theme_choice), use_container_width=True)
-    with col_v2:
-        st.markdown("### Source Details")
+# --- 1️⃣ EXECUTION TIMELINESS ---
+@st.fragment
+def render_execution_timeliness(session, theme_choice):
+    section_header(
+        "1️⃣ Execution Timeliness",
+        "Audit of job duration, execution status, and SLA adherence based on DIM_PIPELINE_JOB_TIMELINESS."
+    )
+    if not section_is_open("execution", default=True):
+        return
+
+    df_jobs = load_section_frame(session, "jobs")
+    if df_jobs is None:
+        return
+
+    if not df_jobs.empty:
+        # Strict Metrics: Raw Counts
+        execution = execution_kpis(df_jobs)
+
+        m1, m2, m3, m4, m5 = st.columns(5)
+        m1.metric("Distinct Pipelines", execution["distinct_pipelines"])
+        m2.metric("Total Job Runs", execution["total_runs"])
+        m3.metric("Success Runs", execution["success_runs"])
+        m4.metric("Failed Runs", execution["fail_runs"])
+        m5.metric("SLA Breaches", execution["sla_breaches"])
+
+        tab_t1, tab_t2 = st.tabs(["📉 Duration Trend", "📋 Raw Execution Log"])
+        
+        with tab_t1:
+            st.plotly_chart(duration_trend_chart(df_jobs, theme_choice), use_container_width=True)
+            
+        with tab_t2:
+            # Displaying raw fields + computed duration for audit
+            st.dataframe(
+                style_table(
+                    df_jobs[[
+                        "PIPELINE_NAME", "JOB_NAME", "EXECUTION_STATUS", "JOB_START_TIME", "END_TIME", "DURATION_MINUTES", "SLA_BREACH"
+                    ]], 
+                    theme_choice
+                ).map(
+                    lambda v: "color: #ef4444; font-weight:bold;" if v == True else ""
+                    , subset=["SLA_BREACH"]
+                ),
+                use_container_width=True
+            )
+    else:
+        st.info("No execution data available.")
+
+
+# --- ⏱ RUN TIMELINE & CRITICAL PATH ---
+@st.fragment
+def render_run_timeline(session, theme_choice):
+    section_header(
+        "⏱ Run Timeline & Critical Path",
+        "Wall-clock time per run split into critical-path job time, idle gaps between jobs and queue time."
+    )
+    if not section_is_open("timeline"):
+        return
+
+    run_timelines, attribution = get_run_timelines(session)
+    if run_timelines.empty:
+        st.info("No execution data available.")
+        return
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Avg Wall Clock (min)", f"{run_timelines['WALL_CLOCK_MINUTES'].mean():,.1f}")
+    m2.metric("Avg Critical Path (min)", f"{run_timelines['CRITICAL_PATH_MINUTES'].mean():,.1f}")
+    m3.metric("Avg Idle Gaps (min)", f"{run_timelines['IDLE_MINUTES'].mean():,.1f}")
+    m4.metric("Avg Queue (min)", f"{run_timelines['QUEUE_MINUTES'].mean():,.1f}")
+
+    tab_c1, tab_c2 = st.tabs(["🧭 Attribution", "📋 Slowest Runs"])
+
+    with tab_c1:
+        st.plotly_chart(critical_path_chart(attribution, theme_choice), use_container_width=True)
+
+    with tab_c2:
         st.dataframe(
             style_table(
-                df_sources[["PIPELINE_NAME", "SOURCE_TABLE", "ROW_COUNT", "BYTES"]],
+                run_timelines.nlargest(50, "WALL_CLOCK_MINUTES")[[
+                    "PIPELINE_NAME", "RUN_ID", "JOBS", "WALL_CLOCK_MINUTES", "CRITICAL_PATH_MINUTES",
+                    "IDLE_MINUTES", "QUEUE_MINUTES", "BOTTLENECK_JOB"
+                ]],
                 theme_choice
             ),
-            use_container_width=True,
-            height=300
+            use_container_width=True
         )
-else:
-    st.info("No volume data available.")
 
-st.markdown("---")
 
-# --- 3️⃣ OUTPUT COMPLETENESS ---
-st.markdown("""
-<div class="section-title">3️⃣ Output Completeness</div>
-<div class="section-subtitle">Verifying data landing in sink tables.</div>
-""", unsafe_allow_html=True)
+# --- 2️⃣ DATA VOLUME & THROUGHPUT ---
+@st.fragment
+def render_data_volume(session, theme_choice):
+    section_header(
+        "2️⃣ Data Volume & Throughput",
+        "Tracking row counts and data size processed by pipelines."
+    )
+    if not section_is_open("volume"):
+        return
 
-if not df_outputs.empty:
-    st.dataframe(
-        style_table(
-            df_outputs[["PIPELINE_NAME", "SINK_TABLE", "ROW_COUNT"]],
-            theme_choice
-        ),
-        use_container_width=True
+    df_sources = load_section_frame(session, "sources")
+    if df_sources is None:
+        return
+
+    if not df_sources.empty:
+        volume = volume_kpis(df_sources)
+        
+        col1, col2 = st.columns(2)
+        col1.metric("Total Rows Processed", f"{volume['total_rows']:,.0f}")
+        col2.metric("Total Data Volume", f"{volume['total_gb']:.2f} GB")
+        
+        col_v1, col_v2 = st.columns([2, 1])
+        with col_v1:
+            st.plotly_chart(volume_trend_chart(df_sources, theme_choice), use_container_width=True)
+        with col_v2:
+            st.markdown("### Source Details")
+            st.dataframe(
+                style_table(
+                    df_sources[["PIPELINE_NAME", "SOURCE_TABLE", "ROW_COUNT", "BYTES"]],
+                    theme_choice
+                ),
+                use_container_width=True,
+                height=300
+            )
+    else:
+        st.info("No volume data available.")
+
+
+# --- 3️⃣ OUTPUT COMPLETENESS ---
+@st.fragment
+def render_output_completeness(session, theme_choice):
+    section_header(
+        "3️⃣ Output Completeness",
+        "Verifying data landing in sink tables."
     )
-else:
-    st.info("No output completeness data available.")
+    if not section_is_open("outputs"):
+        return
+
+    df_outputs = load_section_frame(session, "outputs")
+    if df_outputs is None:
+        return
+
+    if not df_outputs.empty:
+        st.dataframe(
+            style_table(
+                df_outputs[["PIPELINE_NAME", "SINK_TABLE", "ROW_COUNT"]],
+                theme_choice
+            ),
+            use_container_width=True
+        )
+    else:
+        st.info("No output completeness data available.")
 
-st.markdown("---")
 
 # --- 4️⃣ UNIQUENESS & DUPLICATION RISK ---
-st.markdown("""
-<div class="section-title">4️⃣ Uniqueness & Duplication Risk</div>
-<div class="section-subtitle">Monitoring duplicate records against defined thresholds.</div>
-""", unsafe_allow_html=True)
+@st.fragment
+def render_uniqueness(session, theme_choice):
+    section_header(
+        "4️⃣ Uniqueness & Duplication Risk",
+        "Monitoring duplicate records against defined thresholds."
+    )
+    if not section_is_open("uniqueness"):
+        return
+
+    df_uniqueness = load_section_frame(session, "uniqueness")
+    if df_uniqueness is None:
+        return
 
-if not df_uniqueness.empty:
-    # Highlight high risk
-    high_risk_dupes = df_uniqueness[df_uniqueness["DUPLICATE_PERCENTAGE"] > df_uniqueness["DUPLICATE_THRESHOLD"]]
-    
-    if not high_risk_dupes.empty:
-        st.error(f"⚠ Detected {len(high_risk_dupes)} pipelines exceeding duplicate thresholds!")
-    
-    st.dataframe(
-        style_table(
-            df_uniqueness[[
+    if not df_uniqueness.empty:
+        # Breach counts come from the weekly rollup, not a scan of the run table
+        rollup = current_quality_rollups(session)["duplicates"]
+        breaches = breach_count(rollup)
+        
+        if breaches:
+            st.error(f"⚠ Detected {breaches} runs exceeding duplicate thresholds!")
+        
+        tab_u1, tab_u2, tab_u3 = st.tabs(["📈 Weekly Trend", "🚨 Breaches by Pipeline", "📋 Run Detail"])
+
+        with tab_u1:
+            st.plotly_chart(duplicate_trend_chart(duplicate_trends(rollup), theme_choice), use_container_width=True)
+
+        with tab_u2:
+            st.dataframe(style_table(breaches_by_pipeline(rollup), theme_choice), use_container_width=True)
+
+        with tab_u3:
+            table = df_uniqueness[[
                 "PIPELINE_NAME", "SINK_TABLE", "DUPLICATE_COUNT", "DUPLICATE_PERCENTAGE", "DUPLICATE_THRESHOLD"
-            ]],
-            theme_choice
-        ).apply(
-            lambda x: ["background-color: rgba(239, 68, 68, 0.2)"] * len(x) 
-            if x["DUPLICATE_PERCENTAGE"] > x["DUPLICATE_THRESHOLD"] 
-            else [""] * len(x), 
-            axis=1
-        ),
-        use_container_width=True
-    )
-else:
-    st.info("No uniqueness data available.")
+            ]]
+            breach_mask = table["DUPLICATE_PERCENTAGE"] > table["DUPLICATE_THRESHOLD"]
+            st.dataframe(
+                style_table(table, theme_choice).apply(highlight_rows, mask=breach_mask, axis=None),
+                use_container_width=True
+            )
+    else:
+        st.info("No uniqueness data available.")
 
-st.markdown("---")
 
 # --- 5️⃣ DATA INTEGRITY ---
-st.markdown("""
-<div class="section-title">5️⃣ Data Integrity (Null Monitoring)</div>
-<div class="section-subtitle">Tracking null values in critical columns.</div>
-""", unsafe_allow_html=True)
+@st.fragment
+def render_integrity(session, theme_choice):
+    section_header(
+        "5️⃣ Data Integrity (Null Monitoring)",
+        "Tracking null values in critical columns."
+    )
+    if not section_is_open("integrity"):
+        return
+
+    df_integrity = load_section_frame(session, "integrity")
+    if df_integrity is None:
+        return
+
+    if not df_integrity.empty:
+        rollup = current_quality_rollups(session)["nulls"]
+        st.metric("Total Null Records Detected", f"{int(rollup['NULL_COUNT'].sum()):,.0f}")
+        
+        tab_i1, tab_i2 = st.tabs(["📈 Weekly Null Rate", "📋 Run Detail"])
+
+        with tab_i1:
+            st.plotly_chart(null_rate_trend_chart(null_trends(rollup), theme_choice), use_container_width=True)
+
+        with tab_i2:
+            st.dataframe(
+                style_table(
+                    df_integrity[["PIPELINE_NAME", "NULL_COUNT"]],
+                    theme_choice
+                ),
+                use_container_width=True
+            )
+    else:
+        st.info("No integrity data available.")
 
-if not df_integrity.empty:
-    total_nulls = df_integrity["NULL_COUNT"].sum()
-    st.metric("Total Null Records Detected", f"{total_nulls:,.0f}")
-    
-    st.dataframe(
-        style_table(
-            df_integrity[["PIPELINE_NAME", "NULL_COUNT"]],
-            theme_choice
-        ),
-        use_container_width=True
+
+# --- 🌐 ENVIRONMENT COMPARISON ---
+ENV_STATE_ICONS = {"ok": "🟢", "error": "🔴", "timeout": "🟠"}
+
+
+@st.fragment
+def render_environment_comparison(session, theme_choice):
+    section_header(
+        "🌐 Environment Comparison",
+        "Health of the same pipelines across control schemas, loaded concurrently per environment."
     )
-else:
-    st.info("No integrity data available.")
+    if not section_is_open("environments"):
+        return
+
+    try:
+        environments = get_environments(session)
+    except ValueError as e:
+        st.error(f"Invalid environment configuration: {e}")
+        return
+
+    frames_by_env, status = load_environments(session, environments, names=("jobs", "uniqueness", "integrity"))
+
+    cols = st.columns(len(status))
+    for col, (env_name, env_status) in zip(cols, status.items()):
+        col.caption(f"{ENV_STATE_ICONS[env_status['state']]} **{env_name}** • {env_status['detail']}")
+
+    if not frames_by_env:
+        st.info("No environment returned data.")
+        return
+
+    summary = environment_health(frames_by_env)
+    st.dataframe(style_table(summary, theme_choice), use_container_width=True)
+
+    by_pipeline = environment_health(frames_by_env, keys=("ENVIRONMENT", "PIPELINE_NAME"))
+    st.plotly_chart(environment_health_chart(by_pipeline, theme_choice), use_container_width=True)
+
+render_live_monitor(session, theme_choice)
+st.markdown("---")
+render_run_drilldown(session, theme_choice)
+st.markdown("---")
+render_execution_timeliness(session, theme_choice)
+st.markdown("---")
+render_run_timeline(session, theme_choice)
+st.markdown("---")
+render_data_volume(session, theme_choice)
+st.markdown("---")
+render_output_completeness(session, theme_choice)
+st.markdown("---")
+render_uniqueness(session, theme_choice)
+st.markdown("---")
+render_integrity(session, theme_choice)
+st.markdown("---")
+render_environment_comparison(session, theme_choice)
+
+
+# --- ⏱ STARTUP TIMINGS ---
+# First run of a session approximates first paint; later values show per-rerun overhead
+run_ms = elapsed_ms(_script_started)
+if "startup_timings" not in st.session_state:
+    st.session_state.startup_timings = {"imports_ms": IMPORTS_MS, "first_render_ms": run_ms}
+
+with st.sidebar.expander("⏱ Startup Timings"):
+    timings = st.session_state.startup_timings
+    st.caption(f"App imports (first run): {timings['imports_ms']:.0f} ms")
+    st.caption(f"First render: {timings['first_render_ms']:.0f} ms")
+    st.caption(f"This run: imports {IMPORTS_MS:.0f} ms • total {run_ms:.0f} ms")
+    for module, ms in IMPORT_TIMINGS_MS.items():
+        st.caption(f"Lazy import `{module}`: {ms:.0f} ms")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Same import layout as streamlit_app.py: modules are imported from the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+
+import pytest
+
+from services import data_loader
+from services.data_loader import (
+    CONTROL_SCHEMA, ENVIRONMENTS_VAR, LOCAL_DB_PATH, PROJECT_ROOT, get_environments, get_local_connection
+)
+
+
+def set_environments(monkeypatch, value):
+    monkeypatch.setenv(ENVIRONMENTS_VAR, value if isinstance(value, str) else json.dumps(value))
+
+
+@pytest.mark.parametrize("value, message", [
+    ("[{\"name\": \"PRD\"", "not valid JSON"),
+    ([], "non-empty JSON list"),
+    ({"name": "PRD"}, "non-empty JSON list"),
+    ([{"schema": "DB.CONTROL"}], "entry 0"),
+    (["PRD"], "entry 0"),
+    ([{"name": "PRD"}, {"name": "PRD", "db_path": "prd.db"}], "duplicate"),
+])
+def test_invalid_environment_config_raises(monkeypatch, value, message):
+    set_environments(monkeypatch, value)
+    with pytest.raises(ValueError, match=message):
+        get_environments(None)
+
+
+def test_relative_db_paths_resolve_from_project_root(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    set_environments(monkeypatch, [{"name": "UAT", "db_path": "uat_simulation.db"}, {"name": "PRD"}])
+
+    uat, prd = get_environments(None)
+
+    assert uat["db_path"] == os.path.join(PROJECT_ROOT, "uat_simulation.db")
+    assert prd == {"name": "PRD", "schema": CONTROL_SCHEMA, "db_path": None}
+
+
+def test_default_environment_without_session_is_the_local_db(monkeypatch):
+    monkeypatch.delenv(ENVIRONMENTS_VAR, raising=False)
+    assert get_environments(None) == [{"name": "LOCAL", "schema": CONTROL_SCHEMA, "db_path": LOCAL_DB_PATH}]
+
+
+def test_missing_db_file_is_reported_and_not_created(tmp_path):
+    missing = tmp_path / "typo_simulation.db"
+    with pytest.raises(FileNotFoundError, match="typo_simulation.db"):
+        get_local_connection(str(missing))
+    assert not missing.exists()
+
+
+def test_hanging_environment_is_not_resubmitted_on_rerun(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def hanging_load(session, environment, names):
+        calls.append(environment["name"])
+        release.wait()
+        return {}, 0.0
+
+    monkeypatch.setattr(data_loader, "_load_environment", hanging_load)
+    environments = [{"name": "HANGING", "schema": CONTROL_SCHEMA, "db_path": "hanging.db"}]
+
+    for _ in range(3):
+        results, status = data_loader.load_environments(None, environments, timeout=0.05)
+        assert results == {} and status["HANGING"]["state"] == "timeout"
+    assert calls == ["HANGING"]
+
+    release.set()
+    results, status = data_loader.load_environments(None, environments, timeout=5)
+    assert status["HANGING"]["state"] == "ok" and calls == ["HANGING"]
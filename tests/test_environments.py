@@ -0,0 +1,34 @@
+import pandas as pd
+
+from processing.environments import environment_health
+
+START = pd.Timestamp("2026-10-05 08:00", tz="UTC")
+
+
+def jobs_frame(environment):
+    # Both pipelines use RUN_ID 1; PIPE_A's run has two jobs
+    return pd.DataFrame({
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_B"],
+        "RUN_ID": [1, 1, 1],
+        "JOB_NAME": ["EXTRACT", "LOAD", "LOAD"],
+        "JOB_START_TIME": [START] * 3,
+        "END_TIME": [START + pd.Timedelta(minutes=10)] * 3,
+        "EXECUTION_STATUS": ["SUCCESS", "SUCCESS", "FAILED"],
+        "PIPELINE_START_TIME": [START] * 3,
+        "ENVIRONMENT": environment,
+    })
+
+
+def test_runs_are_counted_per_pipeline_and_run_id():
+    frames = {"PRD": {"jobs": jobs_frame("PRD")}, "UAT": {"jobs": jobs_frame("UAT").iloc[:2]}}
+
+    health = environment_health(frames).set_index("ENVIRONMENT")
+
+    assert health.loc["PRD", "RUNS"] == 2
+    assert health.loc["UAT", "RUNS"] == 1
+
+
+def test_runs_per_pipeline_key():
+    health = environment_health({"PRD": {"jobs": jobs_frame("PRD")}}, keys=("ENVIRONMENT", "PIPELINE_NAME"))
+
+    assert health.set_index("PIPELINE_NAME")["RUNS"].to_dict() == {"PIPE_A": 1, "PIPE_B": 1}
@@ -0,0 +1,91 @@
+import pandas as pd
+
+from processing.kpis import compute_dashboard_kpis
+from processing.live import apply_new_runs, init_live_state
+from processing.quality import build_quality_rollups
+from processing.transformations import prepare_dashboard_frames
+
+START = pd.Timestamp("2026-10-05 08:00", tz="UTC")
+
+
+def make_raw_frames(finished=False):
+    # Run 2 is the newest run; its LOAD job is still running unless finished=True
+    jobs = pd.DataFrame({
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_A"],
+        "RUN_ID": [1, 2, 2],
+        "JOB_NAME": ["LOAD", "EXTRACT", "LOAD"],
+        "JOB_START_TIME": [START, START + pd.Timedelta(days=1), START + pd.Timedelta(days=1, minutes=10)],
+        "END_TIME": [
+            START + pd.Timedelta(minutes=30),
+            START + pd.Timedelta(days=1, minutes=10),
+            START + pd.Timedelta(days=1, minutes=90) if finished else pd.NaT,
+        ],
+        "EXECUTION_STATUS": ["SUCCESS", "SUCCESS", "SUCCESS" if finished else "RUNNING"],
+        "PIPELINE_START_TIME": [START, START + pd.Timedelta(days=1), START + pd.Timedelta(days=1)],
+    })
+    sources = pd.DataFrame({
+        "RUN_ID": [1, 2], "PIPELINE_NAME": ["PIPE_A", "PIPE_A"], "SOURCE_TABLE": ["SRC", "SRC"],
+        "PIPELINE_START_TIME": [START, START + pd.Timedelta(days=1)], "ROW_COUNT": [100, 200], "BYTES": [10, 20],
+    })
+    outputs = pd.DataFrame({
+        "RUN_ID": [1, 2], "PIPELINE_NAME": ["PIPE_A", "PIPE_A"], "SINK_TABLE": ["FACT", "FACT"], "ROW_COUNT": [90, 180],
+    })
+    uniqueness = pd.DataFrame({
+        "RUN_ID": [1, 2], "PIPELINE_NAME": ["PIPE_A", "PIPE_A"],
+        "PIPELINE_START_TIME": [START, START + pd.Timedelta(days=1)], "SINK_TABLE": ["FACT", "FACT"],
+        "DUPLICATE_COUNT": [1, 2], "DUPLICATE_PERCENTAGE": [0.5, 2.0], "DUPLICATE_THRESHOLD": [1.0, 1.0],
+    })
+    integrity = pd.DataFrame({
+        "RUN_ID": [1, 2], "PIPELINE_NAME": ["PIPE_A", "PIPE_A"],
+        "PIPELINE_START_TIME": [START, START + pd.Timedelta(days=1)], "NULL_COUNT": [5, 7],
+    })
+    return {"jobs": jobs, "sources": sources, "outputs": outputs, "uniqueness": uniqueness, "integrity": integrity}
+
+
+def watermark_poll(raw):
+    # What load_new_runs returns for watermark RUN_ID 2
+    return prepare_dashboard_frames({name: df[df["RUN_ID"] >= 2].reset_index(drop=True) for name, df in raw.items()})
+
+
+def expected_kpis(raw):
+    kpis = compute_dashboard_kpis(prepare_dashboard_frames({name: df.copy() for name, df in raw.items()}))
+    kpis["execution"]["distinct_pipelines"] = 1
+    return kpis
+
+
+def test_poll_with_nothing_new_changes_nothing():
+    raw = make_raw_frames()
+    state = init_live_state(prepare_dashboard_frames({name: df.copy() for name, df in raw.items()}))
+    kpis = state["kpis"]
+
+    # NULL_COUNT comes back as float when a NULL elsewhere widens the column; still the same rows
+    poll = watermark_poll(raw)
+    poll["integrity"]["NULL_COUNT"] = poll["integrity"]["NULL_COUNT"].astype(float)
+    changed, new_frames, revised = apply_new_runs(state, poll)
+
+    assert changed == set() and new_frames == {} and revised == {}
+    assert state["kpis"] == kpis == expected_kpis(raw)
+
+
+def test_job_updated_in_place_is_counted_once():
+    raw = make_raw_frames()
+    state = init_live_state(prepare_dashboard_frames({name: df.copy() for name, df in raw.items()}))
+
+    finished = make_raw_frames(finished=True)
+    finished["integrity"].loc[1, "NULL_COUNT"] = 70
+    changed, new_frames, revised = apply_new_runs(state, watermark_poll(finished))
+
+    assert changed == {"PIPE_A"}
+    assert new_frames == {}
+    assert len(revised["jobs"][1]) == 1
+    assert state["kpis"] == expected_kpis(finished)
+    assert state["kpis"]["execution"]["total_runs"] == 3
+    assert state["last_delta"]["execution"]["fail_runs"] == -1
+
+    rebuilt = build_quality_rollups(prepare_dashboard_frames({name: df.copy() for name, df in finished.items()}))
+    assert int(state["quality"]["nulls"]["NULL_COUNT"].sum()) == int(rebuilt["nulls"]["NULL_COUNT"].sum()) == 75
+    assert int(state["quality"]["nulls"]["RUNS"].sum()) == 2
+
+    # Polling the same state again is a no-op
+    assert apply_new_runs(state, watermark_poll(finished)) == (set(), {}, {})
+    assert state["kpis"] == expected_kpis(finished)
@@ -0,0 +1,73 @@
+import pandas as pd
+
+from processing.quality import breach_count, build_quality_rollups, update_quality_rollups
+
+START = pd.Timestamp("2026-10-05 08:00", tz="UTC")
+
+
+def make_frames():
+    uniqueness = pd.DataFrame({
+        "RUN_ID": [1, 2, 3],
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_B"],
+        "PIPELINE_START_TIME": [START, START + pd.Timedelta(days=7), START],
+        "SINK_TABLE": ["FACT_A", "FACT_A", "FACT_B"],
+        "DUPLICATE_COUNT": [5, 50, 1],
+        "DUPLICATE_PERCENTAGE": [0.5, 2.5, 0.1],
+        "DUPLICATE_THRESHOLD": [1.0, 1.0, 1.0],
+    })
+    integrity = pd.DataFrame({
+        "RUN_ID": [1, 2, 3],
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_B"],
+        "PIPELINE_START_TIME": [START, START + pd.Timedelta(days=7), START],
+        "NULL_COUNT": [100, 20, 7],
+    })
+    # Run 1 writes to two sinks
+    outputs = pd.DataFrame({
+        "RUN_ID": [1, 1, 2, 3],
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_A", "PIPE_B"],
+        "SINK_TABLE": ["FACT_A", "FACT_A_HIST", "FACT_A", "FACT_B"],
+        "ROW_COUNT": [1000, 500, 2000, 300],
+    })
+    return {"uniqueness": uniqueness, "integrity": integrity, "outputs": outputs}
+
+
+def totals(rollups):
+    nulls = rollups["nulls"]
+    return int(nulls["NULL_COUNT"].sum()), int(nulls["OUTPUT_ROWS"].sum()), int(nulls["RUNS"].sum())
+
+
+def test_rollup_totals_match_raw_sums():
+    frames = make_frames()
+    rollups = build_quality_rollups(frames)
+
+    assert int(rollups["duplicates"]["DUPLICATE_COUNT"].sum()) == frames["uniqueness"]["DUPLICATE_COUNT"].sum()
+    assert breach_count(rollups["duplicates"]) == 1
+    assert totals(rollups) == (127, 3800, 3)
+
+
+def test_multi_sink_run_counts_nulls_once():
+    frames = make_frames()
+    nulls = build_quality_rollups(frames)["nulls"]
+    run_1 = nulls[nulls["PIPELINE_NAME"].eq("PIPE_A") & nulls["NULL_COUNT"].eq(100)]
+
+    assert len(run_1) == 1
+    assert run_1["SINK_TABLE"].iloc[0] == "FACT_A, FACT_A_HIST"
+    assert run_1["OUTPUT_ROWS"].iloc[0] == 1500
+
+
+def test_incremental_update_matches_full_build_when_outputs_arrive_late():
+    frames = make_frames()
+    empty = {name: df.iloc[0:0] for name, df in frames.items()}
+
+    # Poll 1: integrity rows only; poll 2: the output rows and uniqueness rows
+    rollups = build_quality_rollups(empty)
+    rollups = update_quality_rollups(rollups, {**empty, "integrity": frames["integrity"]})
+    assert set(rollups["nulls"]["SINK_TABLE"]) == {"UNMATCHED"}
+    rollups = update_quality_rollups(rollups, {**empty, "outputs": frames["outputs"], "uniqueness": frames["uniqueness"]})
+
+    expected = build_quality_rollups(frames)
+    key = ["PIPELINE_NAME", "SINK_TABLE", "WEEK"]
+    for name in ("nulls", "duplicates"):
+        got = rollups[name].sort_values(key).reset_index(drop=True)
+        want = expected[name].sort_values(key).reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, want, check_dtype=False)
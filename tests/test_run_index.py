@@ -0,0 +1,43 @@
+import pandas as pd
+
+from processing.run_index import build_frame_index, build_run_index, lookup_frame, lookup_run
+
+
+def make_frames():
+    jobs = pd.DataFrame({
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_B", "PIPE_A", "PIPE_A", "PIPE_B"],
+        "RUN_ID": [3, 1, 1, 3, 2],
+        "JOB_NAME": ["LOAD", "LOAD", "LOAD", "EXTRACT", "LOAD"],
+    })
+    outputs = pd.DataFrame({
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_B"],
+        "RUN_ID": [1, 3, 2],
+        "ROW_COUNT": [10, 30, 20],
+    })
+    empty = pd.DataFrame(columns=["PIPELINE_NAME", "RUN_ID", "NULL_COUNT"])
+    return {"jobs": jobs, "outputs": outputs, "integrity": empty}
+
+
+def test_lookup_frame_matches_boolean_mask():
+    jobs = make_frames()["jobs"]
+    frame_index = build_frame_index(jobs)
+    for run_id in [1, 2, 3, 4]:
+        expected = jobs[jobs["RUN_ID"] == run_id].sort_values(["RUN_ID", "JOB_NAME"])
+        found = lookup_frame(frame_index, run_id).sort_values(["RUN_ID", "JOB_NAME"])
+        assert found.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+
+def test_lookup_run_matches_masked_filter_per_pipeline():
+    frames = make_frames()
+    run_index = build_run_index(frames)
+    for pipeline, run_ids in run_index["runs_by_pipeline"].items():
+        for run_id in run_ids:
+            detail = lookup_run(run_index, pipeline, run_id)
+            for name, df in frames.items():
+                expected = df[(df["PIPELINE_NAME"] == pipeline) & (df["RUN_ID"] == run_id)]
+                assert len(detail[name]) == len(expected)
+
+
+def test_runs_by_pipeline_lists_each_run_once_newest_first():
+    run_index = build_run_index(make_frames())
+    assert run_index["runs_by_pipeline"] == {"PIPE_A": [3, 1], "PIPE_B": [2, 1]}
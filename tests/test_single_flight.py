@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from utils import single_flight as sf
+
+
+def run_concurrently(callers, fn, key="key"):
+    start = threading.Event()
+    results, errors = [], []
+
+    def call():
+        start.wait()
+        try:
+            results.append(sf.single_flight(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_callers_share_one_execution():
+    sf.reset_flight_stats()
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return pd.DataFrame({"RUN_ID": [1, 2]})
+
+    results, errors = run_concurrently(8, load)
+
+    assert not errors and len(calls) == 1
+    assert sf.FLIGHT_STATS == {"executed": 1, "shared": 7}
+    # Every caller holds its own frame
+    assert len({id(df) for df in results}) == 8
+    assert all(df["RUN_ID"].tolist() == [1, 2] for df in results)
+    assert sf._in_flight == {}
+
+
+def test_leader_gets_the_original_result():
+    frame = pd.DataFrame({"RUN_ID": [1]})
+    assert sf.single_flight("solo", lambda: frame) is frame
+
+
+def test_errors_reach_every_caller_and_the_key_is_released():
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError("backend down")
+
+    results, errors = run_concurrently(4, fail)
+
+    assert results == [] and len(errors) == 4
+    assert all(str(e) == "backend down" for e in errors)
+    assert sf._in_flight == {}
+    # The next call runs again instead of reusing the failure
+    assert sf.single_flight("key", lambda: pd.DataFrame({"RUN_ID": [3]}))["RUN_ID"].tolist() == [3]
+
+
+def test_failure_without_concurrency_is_raised():
+    def fail():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        sf.single_flight("bad", fail)
+    assert sf._in_flight == {}
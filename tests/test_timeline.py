@@ -0,0 +1,64 @@
+import pandas as pd
+
+from processing.timeline import compute_job_timeline, compute_run_timelines, critical_path_attribution
+
+START = pd.Timestamp("2026-10-05 08:00")
+
+
+def at(minutes):
+    return START + pd.Timedelta(minutes=minutes)
+
+
+def make_jobs():
+    # PIPE_A run 1: queue 5, EXTRACT 5-20, TRANSFORM 10-30 (overlaps), idle 30-40, LOAD 40-50
+    # PIPE_B reuses RUN_ID 1 with a single job: queue 2, LOAD 2-12
+    return pd.DataFrame({
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_A", "PIPE_A", "PIPE_B"],
+        "RUN_ID": [1, 1, 1, 1],
+        "JOB_NAME": ["EXTRACT", "TRANSFORM", "LOAD", "LOAD"],
+        "JOB_START_TIME": [at(5), at(10), at(40), at(2)],
+        "END_TIME": [at(20), at(30), at(50), at(12)],
+        "EXECUTION_STATUS": ["SUCCESS"] * 4,
+        "PIPELINE_START_TIME": [START] * 4,
+    })
+
+
+def test_queue_idle_and_critical_path_add_up_to_wall_clock():
+    runs = compute_run_timelines(compute_job_timeline(make_jobs())).set_index("PIPELINE_NAME")
+
+    parts = runs["QUEUE_MINUTES"] + runs["IDLE_MINUTES"] + runs["CRITICAL_PATH_MINUTES"]
+    pd.testing.assert_series_equal(parts, runs["WALL_CLOCK_MINUTES"], check_names=False)
+    assert runs.loc["PIPE_A", "WALL_CLOCK_MINUTES"] == 50
+    assert runs.loc["PIPE_A", "IDLE_MINUTES"] == 10
+    assert runs.loc["PIPE_A", "BOTTLENECK_JOB"] == "EXTRACT"
+
+
+def test_same_run_id_in_two_pipelines_is_two_runs():
+    job_timeline = compute_job_timeline(make_jobs())
+    runs = compute_run_timelines(job_timeline).set_index("PIPELINE_NAME")
+
+    assert len(runs) == 2
+    assert runs.loc["PIPE_A", "JOBS"] == 3
+    assert runs.loc["PIPE_B", "WALL_CLOCK_MINUTES"] == 12
+    assert runs.loc["PIPE_B", "QUEUE_MINUTES"] == 2
+    assert not critical_path_attribution(job_timeline).empty
+
+
+def test_jobs_still_running_are_left_out():
+    jobs = make_jobs()
+    # A second PIPE_A run whose only job has not finished, and an open job in PIPE_B's run
+    jobs = pd.concat([jobs, pd.DataFrame({
+        "PIPELINE_NAME": ["PIPE_A", "PIPE_B"],
+        "RUN_ID": [2, 1],
+        "JOB_NAME": ["EXTRACT", "PUBLISH"],
+        "JOB_START_TIME": [at(60), at(15)],
+        "END_TIME": [pd.NaT, pd.NaT],
+        "EXECUTION_STATUS": ["RUNNING"] * 2,
+        "PIPELINE_START_TIME": [at(60), START],
+    })], ignore_index=True)
+
+    runs = compute_run_timelines(compute_job_timeline(jobs)).set_index(["PIPELINE_NAME", "RUN_ID"])
+
+    assert list(runs.index) == [("PIPE_A", 1), ("PIPE_B", 1)]
+    assert runs.loc[("PIPE_B", 1), "JOBS"] == 1
+    assert runs.loc[("PIPE_B", 1), "WALL_CLOCK_MINUTES"] == 12
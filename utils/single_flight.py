@@ -0,0 +1,53 @@
+import threading
+
+# Single-flight: concurrent callers asking for the same key share one execution.
+# st.cache_data already serialises misses per key, so this matters for the uncached
+# paths (live polls, environment loads): only the first caller hits the backend and
+# the others wait for its result.
+
+_lock = threading.Lock()
+_in_flight = {}
+
+# Process-wide counters, read by the load-test harness
+FLIGHT_STATS = {"executed": 0, "shared": 0}
+
+
+def single_flight(key, fn):
+    with _lock:
+        call = _in_flight.get(key)
+        leader = call is None
+        if leader:
+            call = {"done": threading.Event(), "waiters": 0, "copies": [], "error": None}
+            _in_flight[key] = call
+            FLIGHT_STATS["executed"] += 1
+        else:
+            call["waiters"] += 1
+            FLIGHT_STATS["shared"] += 1
+
+    if not leader:
+        call["done"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["copies"].pop()
+
+    try:
+        result = fn()
+    except BaseException as e:
+        call["error"] = e
+        raise
+    finally:
+        with _lock:
+            # No caller can join once the key is released, so the waiter count is final
+            del _in_flight[key]
+        if call["error"] is None:
+            # Waiters get their own copy, made before the leader's caller can mutate the
+            # result in place; without concurrency nothing is copied
+            call["copies"] = [result.copy() for _ in range(call["waiters"])]
+        call["done"].set()
+    return result
+
+
+def reset_flight_stats():
+    with _lock:
+        FLIGHT_STATS["executed"] = 0
+        FLIGHT_STATS["shared"] = 0
@@ -0,0 +1,22 @@
+import importlib
+import sys
+import time
+
+# First-import cost per module for this worker process (reported in the sidebar)
+IMPORT_TIMINGS_MS = {}
+
+
+def timed_import(module_name):
+    # Heavy modules are imported on first use instead of at app start
+    # Always go through import_module: a module another session is still importing is already
+    # in sys.modules but only partially initialised, and the import lock waits for it to finish.
+    already_loaded = module_name in sys.modules
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if not already_loaded:
+        IMPORT_TIMINGS_MS.setdefault(module_name, (time.perf_counter() - started) * 1000)
+    return module
+
+
+def elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000